@@ -106,19 +106,42 @@ as ISO-8601 UTC strings computed as:
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import random
 from enum import Enum
 import math
 import os
 import json
+import hashlib
+import functools
+import heapq
+import bisect
 import pdb
 import argparse
-from collections import defaultdict
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Parallel, delayed
+
+try:
+    import orjson  # optional: faster JSON output
+except ImportError:
+    orjson = None
 
 # Base UNIX epoch for midnight January 1st, 2024 UTC
 BASE_UNIX_EPOCH_2024 = 1704067200
 
+# Washrooms per worker task when building wait-time series in parallel
+WAIT_WASHROOMS_PER_JOB = 100
+
+# Timestamp format of the interval keys in all_wait_times.json
+WAIT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# On-disk cache of parsed waiting-time series (bump the version whenever
+# the cached block layout or its contents change)
+WAIT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cco")
+WAIT_CACHE_VERSION = 2
+
 
 class CrewStatus(Enum):
     IDLE = "idle"
@@ -136,7 +159,46 @@ class CleaningType(Enum):
     USAGE_BASED = "usage_based"
 
 
-@dataclass
+# Dense integer codes for CleaningType (index into per-type arrays)
+CLEANING_TYPE_ID = {cleaning_type: i for i, cleaning_type in enumerate(CleaningType)}
+
+# Cleaning duration (minutes) per CleaningType when the config omits it
+DEFAULT_CLEANING_DURATIONS = {
+    CleaningType.ROUTINE: 15.0,
+    CleaningType.EMERGENCY: 25.0,
+    CleaningType.CALL_IN: 20.0,
+    CleaningType.DEEP_CLEAN: 45.0,
+    CleaningType.USAGE_BASED: 15.0,
+}
+
+# Dense integer codes for CrewStatus, and the record layout of one crew
+# schedule event (task / restroom ids are interned, -1 = None)
+CREW_STATUS_ID = {status: i for i, status in enumerate(CrewStatus)}
+SCHEDULE_EVENT_DTYPE = np.dtype([
+    ("start", np.float64),
+    ("end", np.float64),
+    ("task_id", np.int32),
+    ("restroom_id", np.int32),
+    ("status", np.int8),
+])
+
+# Integer codes compared against on the array paths (crew_status,
+# cleaning_type_id); the enums stay at the API boundary. CLEANING, TRAVELING
+# and BREAK are consecutive codes, so "busy" is a single range test.
+STATUS_IDLE = CREW_STATUS_ID[CrewStatus.IDLE]
+STATUS_CLEANING = CREW_STATUS_ID[CrewStatus.CLEANING]
+STATUS_TRAVELING = CREW_STATUS_ID[CrewStatus.TRAVELING]
+STATUS_BREAK = CREW_STATUS_ID[CrewStatus.BREAK]
+TYPE_ROUTINE = CLEANING_TYPE_ID[CleaningType.ROUTINE]
+TYPE_EMERGENCY = CLEANING_TYPE_ID[CleaningType.EMERGENCY]
+TYPE_DEEP_CLEAN = CLEANING_TYPE_ID[CleaningType.DEEP_CLEAN]
+
+# Enum sets tested per crew member / task on the object paths
+PREEMPTABLE_STATUSES = frozenset({CrewStatus.CLEANING, CrewStatus.TRAVELING})
+URGENT_CLEANING_TYPES = frozenset({CleaningType.CALL_IN, CleaningType.EMERGENCY})
+
+
+@dataclass(slots=True)
 class CleaningCrewMember:
     """Represents a cleaning crew member."""
     crew_id: str
@@ -155,7 +217,7 @@ class CleaningCrewMember:
     last_restock_time: float = 0.0     # Last time supplies were restocked
 
 
-@dataclass
+@dataclass(slots=True)
 class CleaningTask:
     """Represents a cleaning task."""
     task_id: str
@@ -171,6 +233,15 @@ class CleaningTask:
     passenger_impact_score: float = 0.0
     disruption_cost: float = 0.0
     capacity_reduction: float = 0.0
+    was_preempted: bool = False  # Set when the task lost all its crew to an urgent task
+    cleaning_type_id: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.cleaning_type_id = CLEANING_TYPE_ID[self.cleaning_type]
+
+
+# Crew/task matching strategies for CleaningCrewOptimizer.optimize_crew_assignment
+ASSIGNMENT_METHODS = ("greedy", "hungarian")
 
 
 class CleaningCrewOptimizer:
@@ -181,7 +252,9 @@ class CleaningCrewOptimizer:
                  travel_time_matrix: Dict[str, Dict[str, float]],
                  simulation_duration: float,
                  dt: float,
-                 config_path: str = "crew_config.json"):
+                 config_path: str = "crew_config.json",
+                 shortest_path_travel: bool = False,
+                 assignment_method: str = "greedy"):
         """
         Args:
             restrooms: Dict like {'R1': {'floor': 1, 'capacity_M': 0.4, 'capacity_F': 0.4}, ...}
@@ -191,12 +264,28 @@ class CleaningCrewOptimizer:
             simulation_duration: Total simulation time (seconds)
             dt: Time step (seconds)
             config_path: Path to crew configuration JSON file
+            shortest_path_travel: If True, travel between two locations takes
+                the fastest route through the matrix (all-pairs shortest
+                paths) rather than the direct entry; pairs with no route
+                still stop the simulation.
+            assignment_method: How ready tasks are matched to available crew
+                each step: 'greedy' (tasks in priority order each take their
+                best crew) or 'hungarian' (optimal crew-task matching with
+                scipy's linear_sum_assignment, one seat per round).
         """
         self.restrooms = restrooms
         self.travel_time_matrix = travel_time_matrix  # store the mandatory matrix
+        self.shortest_path_travel = shortest_path_travel
+        if assignment_method not in ASSIGNMENT_METHODS:
+            raise ValueError(
+                f"Unknown assignment_method '{assignment_method}' "
+                f"(expected one of {', '.join(ASSIGNMENT_METHODS)})"
+            )
+        self.assignment_method = assignment_method
         self.simulation_duration = simulation_duration
         self.dt = dt
         self.time_steps = np.arange(0, simulation_duration, dt)
+        self.n_steps = len(self.time_steps)
         
         # Load configuration
         self.config = self._load_config(config_path)
@@ -206,36 +295,105 @@ class CleaningCrewOptimizer:
         self.cleaning_tasks: List[CleaningTask] = []
         self.completed_tasks: List[CleaningTask] = []
         
-        # KPI tracking
+        # Lookup indices kept alongside the lists above:
+        #   _task_by_id / _task_pos: task_id -> task / position in cleaning_tasks
+        #   _tasks_by_crew: crew_id -> {task_id: task} of tasks the crew was
+        #     assigned to and that may still be open (pruned lazily)
+        #   _completed_ids: task_ids in completed_tasks
+        #   _completed_by_type / _completed_urgent (call-ins and emergencies) /
+        #     _completed_high_priority (priority >= 4): completed_tasks
+        #     partitions, in completion order
+        #   _completed_by_prefix: count of completed tasks per task_id prefix
+        #     (the part before the first "_", e.g. CALLIN)
+        #   _pending_heap: (required_time, position, task_id) of tasks not yet
+        #     within the assignment horizon
+        #   _ready_tasks: task_id -> task within the horizon and (as of the
+        #     last pass) unassigned and not completed
+        #   _ready_queue: the _ready_tasks entries as (assignment order key,
+        #     position, task), kept sorted (see _assignment_order_key)
+        #   _open_urgent_by_restroom: restroom_id -> tasks with priority >= 3
+        #     that may still be open (completed ones pruned lazily)
+        self._task_by_id: Dict[str, CleaningTask] = {}
+        self._task_pos: Dict[str, int] = {}
+        self._pending_heap: List[Tuple[float, int, str]] = []
+        self._ready_tasks: Dict[str, CleaningTask] = {}
+        self._ready_queue: List[Tuple[tuple, int, CleaningTask]] = []
+        self._open_urgent_by_restroom: Dict[str, List[CleaningTask]] = defaultdict(list)
+        self._tasks_by_crew: Dict[str, Dict[str, CleaningTask]] = defaultdict(dict)
+        self._completed_ids: set = set()
+        self._completed_by_type: Dict[CleaningType, List[CleaningTask]] = {ct: [] for ct in CleaningType}
+        self._completed_urgent: List[CleaningTask] = []
+        self._completed_high_priority: List[CleaningTask] = []
+        self._completed_by_prefix: Counter = Counter()
+        
+        # Completed-task KPI inputs, extended as tasks complete (see
+        # _completed_task_kpis); a completed task's fields no longer change
+        self._completed_kpi_cache: Dict = self._empty_completed_kpi_cache()
+        
+        # KPI tracking: KPIs are sampled every hour of simulated time into one
+        # preallocated (n_samples, n_kpis) matrix, a row per sample;
+        # kpi_history[name] is the column view for that KPI
+        self._kpi_interval = max(1, int(3600 // self.dt))
+        n_kpi_samples = len(range(0, self.n_steps, self._kpi_interval))
+        self._kpi_names = (
+            'total_cost',
+            'avg_response_time',
+            'passenger_satisfaction',
+            'crew_utilization',
+            'emergency_response_time',
+            'task_completion_rate',
+            'overtime_hours',
+            'cleaning_quality_score',
+            'disruption_cost',
+            'avg_capacity_reduction'
+        )
+        self._kpi_matrix = np.zeros((n_kpi_samples, len(self._kpi_names)), dtype=np.float64)
         self.kpi_history = {
-            'total_cost': [],
-            'avg_response_time': [],
-            'passenger_satisfaction': [],
-            'crew_utilization': [],
-            'emergency_response_time': [],
-            'task_completion_rate': [],
-            'overtime_hours': [],
-            'cleaning_quality_score': [],
-            'disruption_cost': [],
-            'avg_capacity_reduction': []
+            name: self._kpi_matrix[:, j] for j, name in enumerate(self._kpi_names)
         }
         
+        # Waiting-time inputs (set by process_waiting_time_profile; the
+        # per-step stacked tables are built by _stack_waiting_times)
+        self.waiting_time_data: Optional[Dict[str, np.ndarray]] = None
+        self._max_wait_by_step: Optional[np.ndarray] = None
+        
         # Track active cleaning operations (for capacity reduction)
-        self.active_cleanings = {}  # {restroom_id: [task_ids]}
+        # {restroom_id: Counter(task_id -> times started)}; a preempted task
+        # that is started again counts once per start until it completes
+        self.active_cleanings: Dict[str, Counter] = {}
+        self._active_cleaning_count: Dict[str, int] = {}  # {restroom_id: total of the Counter}
+        
+        # Accumulated cost of supply restocks
+        self.total_restock_cost = 0.0
         
         # Usage tracking placeholders (not really used now)
         self.restroom_usage_counts = {restroom_id: 0.0 for restroom_id in self.restrooms.keys()}
+        self.usage_threshold_for_cleaning = 15
         self.last_cleaning_time = {restroom_id: 0.0 for restroom_id in self.restrooms.keys()}
         
         # Config & crew
         self._setup_from_config()
         self._setup_crew_base_locations()
+        self._setup_travel_time_index()
         self._initialize_crew()
-        
-        # Initialize empty schedules dict (one list per crew)
+        self._setup_crew_arrays()
+        self._setup_max_cleaners()
+        
+        # Crew schedules are recorded into per-crew SCHEDULE_EVENT_DTYPE
+        # buffers (grown by doubling) and materialised into crew_schedules,
+        # one list of event dicts per crew, by finalize_schedules()
+        self._schedule_events: Dict[str, np.ndarray] = {}
+        self._schedule_len: Dict[str, int] = {}
+        self._schedule_labels: List[str] = []
+        self._schedule_label_code: Dict[str, int] = {}
         self.crew_schedules: Dict[str, List[Dict]] = {
             crew.crew_id: [] for crew in self.crew_members
         }
+        
+        # Simulation progress messages are buffered by _log and written out
+        # by _flush_log (at each progress update and at the end of a run)
+        self.verbose = True
+        self._log_buf: List[str] = []
     
     # ---------------- CONFIG / SETUP ----------------
     
@@ -254,8 +412,7 @@ class CleaningCrewOptimizer:
                 pass
         
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            return json.loads(_read_config_text(config_path, os.stat(config_path).st_mtime_ns))
         except (FileNotFoundError, json.JSONDecodeError):
             print(f"Warning: using default crew config (could not read {config_path}).")
             return self._get_default_config()
@@ -298,20 +455,31 @@ class CleaningCrewOptimizer:
         self.restock_time = supply_config.get('restock_time_minutes', 10.0) * 60
         self.restock_cost = supply_config.get('restock_cost', 25.0)
         
+        # Supplies used per cleaning, indexed by CLEANING_TYPE_ID (deep cleans
+        # use twice the base amount, emergencies 1.5x)
+        supply_factor = {CleaningType.DEEP_CLEAN: 2.0, CleaningType.EMERGENCY: 1.5}
+        self._supplies_needed_by_type = np.array([
+            self.supplies_per_cleaning * supply_factor.get(cleaning_type, 1.0)
+            for cleaning_type in CLEANING_TYPE_ID
+        ], dtype=np.float64)
+        
         # Cleaning parameters
         self._setup_cleaning_parameters_from_config()
     
     def _setup_cleaning_parameters_from_config(self):
         cleaning_config = self.config.get('cleaning_operations', {})
         
+        # Config keys are the CleaningType values ("routine", "call_in", ...)
         durations = cleaning_config.get('cleaning_durations', {})
         self.cleaning_durations = {
-            CleaningType.ROUTINE: durations.get('routine', 15.0),
-            CleaningType.EMERGENCY: durations.get('emergency', 25.0),
-            CleaningType.CALL_IN: durations.get('call_in', 20.0),
-            CleaningType.DEEP_CLEAN: durations.get('deep_clean', 45.0),
-            CleaningType.USAGE_BASED: durations.get('usage_based', 15.0)
+            cleaning_type: durations.get(cleaning_type.value, default)
+            for cleaning_type, default in DEFAULT_CLEANING_DURATIONS.items()
         }
+        # Same durations indexed by CLEANING_TYPE_ID
+        self._duration_by_type = np.array(
+            [self.cleaning_durations[cleaning_type] for cleaning_type in CLEANING_TYPE_ID],
+            dtype=np.float64
+        )
         
         # Cost parameters / coefficients
         cost_config = cleaning_config.get('cost_parameters', {})
@@ -337,6 +505,45 @@ class CleaningCrewOptimizer:
             'Base_3': {'floor': 3, 'x': 100, 'y': 12}
         }
     
+    def _setup_travel_time_index(self):
+        """
+        Pack travel_time_matrix into a dense array indexed by location.
+
+        self._loc_idx maps every location (matrix origins/destinations,
+        restrooms and crew bases) to a row/column of self._tt; pairs missing
+        from the matrix are NaN so lookups can still report them.
+        """
+        locations = dict.fromkeys(self.travel_time_matrix)
+        for row in self.travel_time_matrix.values():
+            locations.update(dict.fromkeys(row))
+        locations.update(dict.fromkeys(self.restrooms))
+        locations.update(dict.fromkeys(self.crew_bases))
+        self._loc_idx: Dict[str, int] = {loc: i for i, loc in enumerate(locations)}
+        
+        n = len(self._loc_idx)
+        self._tt = np.full((n, n), np.nan, dtype=np.float64)
+        for from_wc, row in self.travel_time_matrix.items():
+            i = self._loc_idx[from_wc]
+            for to_wc, travel_time in row.items():
+                self._tt[i, self._loc_idx[to_wc]] = travel_time
+        
+        if self.shortest_path_travel:
+            self._tt = self._shortest_path_travel_times(self._tt)
+        
+        # location -> depot round trip plus restock time, filled on first use
+        self._restock_time_by_loc: Dict[str, float] = {}
+    
+    @staticmethod
+    def _shortest_path_travel_times(tt: np.ndarray) -> np.ndarray:
+        """All-pairs fastest travel times over a directed matrix (NaN = no arc / no route)."""
+        from scipy.sparse.csgraph import csgraph_from_dense, floyd_warshall
+        
+        # Via csgraph_from_dense so explicit zero travel times stay arcs
+        graph = csgraph_from_dense(np.nan_to_num(tt, nan=np.inf), null_value=np.inf)
+        fastest = floyd_warshall(graph, directed=True)
+        fastest[np.isinf(fastest)] = np.nan
+        return fastest
+    
     def _initialize_crew(self):
         """Initialize cleaning crew members from configuration."""
         crew_configs = self.config.get('crew_management', {}).get('crew_members', [])
@@ -354,6 +561,67 @@ class CleaningCrewOptimizer:
             )
             self.crew_members.append(crew_member)
     
+    def _setup_crew_arrays(self):
+        """
+        Allocate per-crew NumPy arrays aligned with self.crew_members
+        (row i <-> crew_members[i]) for the vectorised assignment code.
+        """
+        n = len(self.crew_members)
+        self._crew_by_id: Dict[str, CleaningCrewMember] = {
+            crew.crew_id: crew for crew in self.crew_members
+        }
+        self._crew_row: Dict[str, int] = {
+            crew.crew_id: i for i, crew in enumerate(self.crew_members)
+        }
+        self.crew_loc_idx = np.full(n, -1, dtype=np.intp)
+        self.crew_skill = np.zeros(n, dtype=np.float64)
+        self.crew_rate = np.zeros(n, dtype=np.float64)
+        self.crew_supplies = np.zeros(n, dtype=np.float64)
+        self.crew_shift_start = np.zeros(n, dtype=np.float64)
+        self.crew_shift_end = np.zeros(n, dtype=np.float64)
+        self.crew_shift_hours = np.zeros(n, dtype=np.float64)
+        self.crew_task_end_time = np.zeros(n, dtype=np.float64)
+        self.crew_emergency_capable = np.zeros(n, dtype=bool)
+        self.crew_status = np.zeros(n, dtype=np.int8)  # CREW_STATUS_ID codes
+        self._fill_crew_arrays()
+    
+    def _sync_crew_arrays(self):
+        """
+        Copy crew state from the CleaningCrewMember objects (which remain the
+        source of truth) into the per-crew arrays. The simulation keeps rows
+        in step as it changes crew state; call this after modifying crew
+        members directly (adding or removing crew members rebuilds the
+        crew_id indices and arrays).
+        """
+        if (len(self._crew_row) != len(self.crew_members)
+                or any(self._crew_by_id.get(crew.crew_id) is not crew or self._crew_row[crew.crew_id] != i
+                       for i, crew in enumerate(self.crew_members))):
+            self._setup_crew_arrays()
+        else:
+            self._fill_crew_arrays()
+    
+    def _fill_crew_arrays(self):
+        for crew in self.crew_members:
+            i = self._crew_row[crew.crew_id]
+            # Fixed for the run: skill, pay, shift (hours cached once) and
+            # emergency capability
+            self.crew_skill[i] = crew.skill_level
+            self.crew_rate[i] = crew.hourly_rate
+            self.crew_shift_start[i] = crew.shift_start
+            self.crew_shift_end[i] = crew.shift_end
+            self.crew_shift_hours[i] = (crew.shift_end - crew.shift_start) / 3600.0
+            self.crew_emergency_capable[i] = crew.emergency_response_capable
+            self._sync_crew_row(crew)
+        self._setup_on_shift_table()
+    
+    def _sync_crew_row(self, crew: CleaningCrewMember):
+        """Copy the state the simulation changes (location, supplies, task end, status)."""
+        i = self._crew_row[crew.crew_id]
+        self.crew_loc_idx[i] = self._loc_idx.get(crew.current_location, -1)
+        self.crew_supplies[i] = crew.supplies_remaining
+        self.crew_task_end_time[i] = crew.current_task_end_time
+        self.crew_status[i] = CREW_STATUS_ID[crew.status]
+    
     # ---------------- INPUT PROCESSING ----------------
     
     def process_waiting_time_profile(self, w_r: Dict):
@@ -367,6 +635,42 @@ class CleaningCrewOptimizer:
         self.waiting_time_data = w_r
         self.call_in_task_counter = 1000
         self.emergency_task_counter = 2000
+        self._stack_waiting_times()
+    
+    def _stack_waiting_times(self):
+        """
+        Precompute self._max_wait_by_step, a (T, n_restrooms) array holding
+        max(0, wait M, wait F) per restroom and time step (NaN and missing
+        sections count as 0), columns in self._wait_restroom_ids order.
+        
+        Also precompute the call-in trigger for every restroom and step:
+        self._call_in_priority_by_step holds the priority of the task the
+        wait would trigger (5 emergency, 4/3 call-in, 0 none),
+        self._call_in_steps flags steps where any restroom triggers and
+        self._call_in_impact_by_step holds the passenger impact score such a
+        task gets (no arrival/queue data, so it depends on the wait only).
+        """
+        w_r = self.waiting_time_data
+        self._wait_restroom_ids = list(self.restrooms.keys())
+        sections = [
+            [np.asarray(w_r[section_id]) for section_id in (f"{r}-M", f"{r}-F") if section_id in w_r]
+            for r in self._wait_restroom_ids
+        ]
+        series = [a for pair in sections for a in pair]
+        n_steps = max((len(a) for a in series), default=0)
+        dtype = np.result_type(*series) if series else np.float64
+        
+        max_wait = np.zeros((n_steps, len(self._wait_restroom_ids)), dtype=dtype)
+        for j, pair in enumerate(sections):
+            for a in pair:
+                col = max_wait[:len(a), j]
+                np.fmax(col, a, out=col)
+        self._max_wait_by_step = max_wait
+        self._call_in_priority_by_step = np.select(
+            [max_wait > 640, max_wait > 480, max_wait > 360], [5, 4, 3], default=0
+        ).astype(np.int8)
+        self._call_in_steps = self._call_in_priority_by_step.any(axis=1)
+        self._call_in_impact_by_step = self._calculate_passenger_impact_vec(0.0, 0.0, max_wait)
     
     def _schedule_cleanings_from_requirements(self, cleaning_requirements: List[Tuple[str, int]]):
         """
@@ -381,6 +685,7 @@ class CleaningCrewOptimizer:
             if not (isinstance(t.task_id, str) and t.task_id.startswith("ROUTINE_"))
         ]
         
+        routine_duration = float(self._duration_by_type[TYPE_ROUTINE])
         task_id = 1
         for restroom_id, num_times in cleaning_requirements:
             if num_times <= 0:
@@ -388,22 +693,162 @@ class CleaningCrewOptimizer:
             if restroom_id not in self.restrooms:
                 continue
             
+            # Evenly spaced over the simulation: k * step for k = 1..num_times
             step = self.simulation_duration / (num_times + 1)
-            for k in range(1, num_times + 1):
-                current_time = k * step
-                task = CleaningTask(
-                    task_id=f"ROUTINE_{task_id:04d}",
+            times = (np.arange(1, num_times + 1, dtype=np.float64) * step).tolist()
+            self.cleaning_tasks.extend(
+                CleaningTask(
+                    task_id=f"ROUTINE_{task_id + k:04d}",
                     restroom_id=restroom_id,
                     cleaning_type=CleaningType.ROUTINE,
                     priority=2,
-                    estimated_duration=self.cleaning_durations[CleaningType.ROUTINE],
+                    estimated_duration=routine_duration,
                     required_time=current_time,
                     deadline=current_time + 1800,
                     created_time=0.0,
                     assigned_crew=[]
                 )
-                self.cleaning_tasks.append(task)
-                task_id += 1
+                for k, current_time in enumerate(times)
+            )
+            task_id += num_times
+        
+        self._index_tasks()
+    
+    def _index_tasks(self):
+        """Rebuild the task_id -> task / position indices from cleaning_tasks."""
+        self._task_by_id = {t.task_id: t for t in self.cleaning_tasks}
+        self._task_pos = {t.task_id: i for i, t in enumerate(self.cleaning_tasks)}
+        self._pending_heap = [
+            (t.required_time, i, t.task_id) for i, t in enumerate(self.cleaning_tasks)
+        ]
+        heapq.heapify(self._pending_heap)
+        self._ready_tasks = {}
+        self._ready_queue = []
+        self._open_urgent_by_restroom = defaultdict(list)
+        for t in self.cleaning_tasks:
+            if t.priority >= 3:
+                self._open_urgent_by_restroom[t.restroom_id].append(t)
+    
+    def _add_tasks(self, tasks: List[CleaningTask]):
+        """Append new tasks to cleaning_tasks and the task indices."""
+        for task in tasks:
+            self._task_by_id[task.task_id] = task
+            self._task_pos[task.task_id] = len(self.cleaning_tasks)
+            self.cleaning_tasks.append(task)
+            self._queue_task(task)
+            if task.priority >= 3:
+                self._open_urgent_by_restroom[task.restroom_id].append(task)
+    
+    def _queue_task(self, task: CleaningTask):
+        """(Re)queue a task for assignment once its required_time is near."""
+        heapq.heappush(self._pending_heap,
+                       (task.required_time, self._task_pos[task.task_id], task.task_id))
+    
+    @staticmethod
+    def _assignment_order_key(task: CleaningTask) -> tuple:
+        """
+        Sort key for the order tasks are offered crew in: priority (highest
+        first), then deadline (earliest first; tasks without one last), then
+        passenger impact (highest first). This orders tasks the same way as
+        (-priority, deadline - current_time or inf, -impact) at any time.
+        """
+        if task.deadline:
+            return (-task.priority, 0, task.deadline, -task.passenger_impact_score)
+        return (-task.priority, 1, 0.0, -task.passenger_impact_score)
+    
+    def _get_ready_tasks(self, current_time: float) -> List[CleaningTask]:
+        """
+        Unassigned, uncompleted tasks with required_time within 30 minutes
+        of current_time, in assignment order (_assignment_order_key, ties in
+        cleaning_tasks order).
+        """
+        if len(self._task_pos) != len(self.cleaning_tasks):
+            # Tasks added to cleaning_tasks directly; re-sync the indices
+            self._index_tasks()
+        
+        horizon = current_time + 1800
+        heap = self._pending_heap
+        queue = self._ready_queue
+        while heap and heap[0][0] <= horizon:
+            _, pos, task_id = heapq.heappop(heap)
+            if task_id in self._ready_tasks:
+                continue
+            task = self._ready_tasks[task_id] = self._task_by_id[task_id]
+            bisect.insort(queue, (self._assignment_order_key(task), pos, task))
+        
+        ready = []
+        stale = False
+        for _, _, task in queue:
+            if (task.assigned_crew or task.completion_time is not None
+                    or self._task_by_id.get(task.task_id) is not task):
+                # Preempted tasks are re-queued by _preempt_crew_task
+                del self._ready_tasks[task.task_id]
+                stale = True
+            elif task.required_time <= horizon:
+                ready.append(task)
+        if stale:
+            queue[:] = [entry for entry in queue if entry[2].task_id in self._ready_tasks]
+        return ready
+    
+    def _get_pending_tasks(self, current_time: float) -> List[CleaningTask]:
+        """
+        Unassigned, uncompleted tasks with required_time within 30 minutes
+        of current_time, in cleaning_tasks order.
+        """
+        pending = self._get_ready_tasks(current_time)
+        pending.sort(key=lambda t: self._task_pos[t.task_id])
+        return pending
+    
+    def _has_recent_urgent_task(self, restroom_id: str, current_time: float) -> bool:
+        """
+        Whether restroom_id has an uncompleted task of priority >= 3 created
+        within 30 minutes of current_time.
+        """
+        if len(self._task_pos) != len(self.cleaning_tasks):
+            # Tasks added to cleaning_tasks directly; re-sync the indices
+            self._index_tasks()
+        open_urgent = self._open_urgent_by_restroom.get(restroom_id)
+        if not open_urgent:
+            return False
+        open_urgent[:] = [t for t in open_urgent if t.completion_time is None]
+        return any(abs(t.created_time - current_time) < 1800 for t in open_urgent)
+    
+    def _get_task(self, task_id: str) -> CleaningTask:
+        task = self._task_by_id.get(task_id)
+        if task is None:
+            # Task added to cleaning_tasks directly; re-sync the indices
+            self._index_tasks()
+            task = self._task_by_id[task_id]
+        return task
+    
+    def _current_task_of(self, crew: CleaningCrewMember) -> Optional[CleaningTask]:
+        """
+        First open task (in cleaning_tasks order) that lists this crew member
+        in assigned_crew, or None.
+        """
+        crew_tasks = self._tasks_by_crew[crew.crew_id]
+        for task_id in [
+            tid for tid, t in crew_tasks.items()
+            if t.completion_time is not None or not t.assigned_crew
+            or crew.crew_id not in t.assigned_crew
+            or self._task_by_id.get(tid) is not t
+        ]:
+            del crew_tasks[task_id]
+        if not crew_tasks:
+            return None
+        return min(crew_tasks.values(), key=lambda t: self._task_pos[t.task_id])
+    
+    # ---------------- LOGGING ----------------
+    
+    def _log(self, message: str):
+        if self.verbose:
+            self._log_buf.append(message)
+    
+    def _flush_log(self):
+        if self._log_buf:
+            self._log_buf.append("")
+            sys.stdout.write("\n".join(self._log_buf))
+            self._log_buf.clear()
     
     # ---------------- CORE SCORING / ASSIGNMENT ----------------
     
@@ -414,29 +859,49 @@ class CleaningCrewOptimizer:
         Calculate passenger impact score (0–100).
         In this simplified version, we mostly care about waiting_time.
         """
-        arrival_impact = min(arrival_rate / 0.2, 1.0)
-        queue_impact = min(queue_length / 10.0, 1.0)
-        wait_impact = min(waiting_time / 600.0, 1.0)
+        return float(self._calculate_passenger_impact_vec(
+            np.array([arrival_rate]), np.array([queue_length]), np.array([waiting_time])
+        )[0])
+    
+    def _calculate_passenger_impact_vec(self, arrival_rates: np.ndarray,
+                                        queue_lengths: np.ndarray,
+                                        waiting_times: np.ndarray) -> np.ndarray:
+        """_calculate_passenger_impact over arrays (computed in float64)."""
+        arrival_impact = np.minimum(np.asarray(arrival_rates, dtype=np.float64) / 0.2, 1.0)
+        queue_impact = np.minimum(np.asarray(queue_lengths, dtype=np.float64) / 10.0, 1.0)
+        wait_impact = np.minimum(np.asarray(waiting_times, dtype=np.float64) / 600.0, 1.0)
         return (0.3 * arrival_impact + 0.4 * queue_impact + 0.3 * wait_impact) * 100
     
-    def _is_crew_available(self, crew: CleaningCrewMember, current_time: float) -> bool:
-        """Check if crew member is available for assignment (repeating daily shifts)."""
+    def _setup_on_shift_table(self):
+        """
+        Precompute self._on_shift, a (len(time_steps), n_crew) bool table of
+        which crew members are within their (daily) shift at each time step.
+        """
         seconds_per_day = 24.0 * 3600.0
-        time_in_day = current_time % seconds_per_day
-        if time_in_day < crew.shift_start or time_in_day > crew.shift_end:
-            return False
-        if crew.status in [CrewStatus.CLEANING, CrewStatus.TRAVELING, CrewStatus.BREAK]:
-            if crew.current_task_end_time > current_time:
-                return False
-        return True
+        time_in_day = (self.time_steps % seconds_per_day)[:, None]
+        self._on_shift = ((self.crew_shift_start[None, :] <= time_in_day)
+                          & (time_in_day <= self.crew_shift_end[None, :]))
+    
+    def _available_crew_mask(self, current_time: float,
+                             t_idx: Optional[int] = None) -> np.ndarray:
+        """
+        Bool mask over self.crew_members of who can take an assignment: on
+        shift (repeating daily shifts) and not busy with a task that runs past
+        current_time. Pass t_idx when current_time is self.time_steps[t_idx] to use the
+        precomputed shift table.
+        """
+        if t_idx is not None and 0 <= t_idx < len(self._on_shift):
+            on_shift = self._on_shift[t_idx]
+        else:
+            seconds_per_day = 24.0 * 3600.0
+            time_in_day = current_time % seconds_per_day
+            on_shift = (self.crew_shift_start <= time_in_day) & (time_in_day <= self.crew_shift_end)
+        status = self.crew_status
+        busy = (status >= STATUS_CLEANING) & (status <= STATUS_BREAK)
+        return on_shift & ~(busy & (self.crew_task_end_time > current_time))
     
     def _check_crew_supplies(self, crew: CleaningCrewMember, task: CleaningTask) -> bool:
-        supplies_needed = self.supplies_per_cleaning
-        if task.cleaning_type == CleaningType.DEEP_CLEAN:
-            supplies_needed *= 2
-        elif task.cleaning_type == CleaningType.EMERGENCY:
-            supplies_needed *= 1.5
-        return crew.supplies_remaining >= supplies_needed
+        return crew.supplies_remaining >= self._supplies_needed_by_type[task.cleaning_type_id]
     
     def _can_crew_handle_task(self, crew: CleaningCrewMember,
                               task: CleaningTask,
@@ -499,7 +964,96 @@ class CleaningCrewOptimizer:
         """Here we just reuse the base score (no demand model anymore)."""
         return self._calculate_assignment_score(crew, task, current_time)
     
+    def _travel_time_block(self, from_idx: np.ndarray, to_idx: np.ndarray) -> np.ndarray:
+        """
+        (len(from_idx), len(to_idx)) travel times between location indices
+        (-1 = location not in self._loc_idx); 0 where origin == destination,
+        NaN where the pair is missing.
+        """
+        # Gather the origin rows once, then the destination columns from them
+        travel = self._tt.take(from_idx, axis=0).take(to_idx, axis=1)
+        same = from_idx[:, None] == to_idx[None, :]
+        if from_idx.min(initial=0) < 0 or to_idx.min(initial=0) < 0:
+            unknown = (from_idx < 0)[:, None] | (to_idx < 0)[None, :]
+            travel[unknown] = np.nan
+            same &= ~unknown
+        travel[same] = 0.0
+        return travel
+    
+    def _score_matrix(self, crews: List[CleaningCrewMember],
+                      tasks: List[CleaningTask],
+                      current_time: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorised _calculate_assignment_score / _can_crew_handle_task over all
+        (crew, task) pairs. Returns (scores, feasible), both (n_crew, n_task),
+        computed with the same operations in the same order as the scalar
+        versions so results match them exactly.
+        
+        Crew state is read from the per-crew arrays.
+        """
+        rows = np.array([self._crew_row[c.crew_id] for c in crews], dtype=np.intp)
+        skill = self.crew_skill[rows][:, None]
+        rate = self.crew_rate[rows][:, None]
+        supplies = self.crew_supplies[rows][:, None]
+        emergency_capable = self.crew_emergency_capable[rows][:, None]
+        
+        task_type = np.array([t.cleaning_type_id for t in tasks], dtype=np.intp)
+        deep = task_type == TYPE_DEEP_CLEAN
+        emergency = task_type == TYPE_EMERGENCY
+        high_priority = np.array([t.priority >= 4 for t in tasks], dtype=bool)
+        has_deadline = np.array([bool(t.deadline) for t in tasks], dtype=bool)
+        deadline = np.array([t.deadline if t.deadline else 0.0 for t in tasks], dtype=np.float64)
+        duration = np.array([t.estimated_duration for t in tasks], dtype=np.float64)
+        impact = np.array([t.passenger_impact_score for t in tasks], dtype=np.float64)
+        
+        task_loc_idx = np.array([self._loc_idx.get(t.restroom_id, -1) for t in tasks], dtype=np.intp)
+        travel = self._travel_time_block(self.crew_loc_idx[rows], task_loc_idx)
+        
+        # Feasibility (_can_crew_handle_task)
+        supplies_needed = self._supplies_needed_by_type[task_type]
+        feasible = (emergency_capable | ~emergency) & (supplies >= supplies_needed)
+        missing = feasible & np.isnan(travel)
+        if missing.any():
+            # Same error as the scalar lookup
+            i, j = np.argwhere(missing)[0]
+            self._calculate_travel_time(crews[i].current_location, tasks[j].restroom_id)
+        completion_time = current_time + travel + (duration * 60)
+        feasible &= (~has_deadline | (completion_time <= deadline)
+                     | (high_priority & (completion_time <= deadline + 1800)))
+        
+        # Score (_calculate_assignment_score)
+        scores = np.where(deep, skill * 20, np.where(high_priority, skill * 15, 0.0))
+        scores -= travel * 2
+        scores += np.where(has_deadline & (deadline - current_time < 1800), 30.0, 0.0)
+        scores -= (rate * (duration / 60.0)) * 0.5
+        scores += impact * 0.3
+        
+        return scores, feasible
+    
+    def _setup_max_cleaners(self):
+        """Precompute _compute_bathroom_max_cleaners for every restroom with capacities."""
+        self._max_cleaners: Dict[str, int] = {
+            restroom_id: self._compute_bathroom_max_cleaners(restroom_id)
+            for restroom_id, info in self.restrooms.items()
+            if 'capacity_M' in info and 'capacity_F' in info
+        }
+        # Team speed-up n ** 0.7 for every team size a restroom can take
+        max_team_size = max(self._max_cleaners.values(), default=3)
+        self._team_speedup: List[float] = [n ** 0.7 for n in range(max_team_size + 1)]
+    
+    def _get_team_speedup(self, num_cleaners: int) -> float:
+        if num_cleaners < len(self._team_speedup):
+            return self._team_speedup[num_cleaners]
+        return num_cleaners ** 0.7
+    
     def _get_bathroom_max_cleaners(self, restroom_id: str) -> int:
+        max_cleaners = self._max_cleaners.get(restroom_id)
+        if max_cleaners is None:
+            # Not precomputed (e.g. capacities missing): same lookup/KeyError as before
+            max_cleaners = self._compute_bathroom_max_cleaners(restroom_id)
+        return max_cleaners
+    
+    def _compute_bathroom_max_cleaners(self, restroom_id: str) -> int:
         total_capacity = (self.restrooms[restroom_id]['capacity_M'] +
                           self.restrooms[restroom_id]['capacity_F'])
         if total_capacity > 0.5:
@@ -510,7 +1064,7 @@ class CleaningCrewOptimizer:
             return 1
     
     def _get_current_active_cleaners(self, restroom_id: str) -> int:
-        return len(self.active_cleanings.get(restroom_id, []))
+        return self._active_cleaning_count.get(restroom_id, 0)
     
     def _determine_optimal_cleaner_count(self, task: CleaningTask,
                                          current_time: float,
@@ -522,17 +1076,31 @@ class CleaningCrewOptimizer:
             return min(2, max_available)
         return min(1, max_available)
     
+    @staticmethod
+    def _optimal_cleaner_counts(candidates: List[Tuple[CleaningTask, int]]) -> List[int]:
+        """_determine_optimal_cleaner_count for every (task, max_available) pair at once."""
+        priority = np.fromiter((task.priority for task, _ in candidates), dtype=np.intp, count=len(candidates))
+        max_available = np.fromiter((slots for _, slots in candidates), dtype=np.intp, count=len(candidates))
+        counts = np.select(
+            [max_available <= 0, priority >= 4],
+            [0, np.minimum(2, max_available)],
+            default=np.minimum(1, max_available)
+        )
+        return counts.tolist()
+    
     def _calculate_team_score(self, crew_combo: List[CleaningCrewMember],
                               task: CleaningTask,
-                              current_time: float) -> float:
+                              current_time: float,
+                              individual_scores: Optional[List[float]] = None) -> float:
         """Team score (no disruption term)."""
         if not crew_combo:
             return float('-inf')
         
-        individual_scores = [
-            self._calculate_assignment_score(crew, task, current_time)
-            for crew in crew_combo
-        ]
+        if individual_scores is None:
+            individual_scores = [
+                self._calculate_assignment_score(crew, task, current_time)
+                for crew in crew_combo
+            ]
         base_score = sum(individual_scores) / len(individual_scores)
         
         efficiency_bonus = len(crew_combo) * 10
@@ -544,80 +1112,185 @@ class CleaningCrewOptimizer:
     def _find_best_crew_combination(self, task: CleaningTask,
                                     available_crew: List[CleaningCrewMember],
                                     target_cleaners: int,
-                                    current_time: float) -> List[CleaningCrewMember]:
+                                    current_time: float,
+                                    scores: Optional[np.ndarray] = None,
+                                    feasible: Optional[np.ndarray] = None) -> List[CleaningCrewMember]:
+        """
+        `scores` / `feasible` optionally give this task's column of
+        _score_matrix, aligned with available_crew; otherwise they are
+        computed per crew member.
+        """
         if target_cleaners <= 0 or not available_crew:
             return []
         
-        suitable_crew = [
-            crew for crew in available_crew
-            if self._can_crew_handle_task(crew, task, current_time)
-        ]
+        if target_cleaners == 1 and feasible is not None:
+            # First highest-scoring feasible crew member, as the loop below
+            masked = np.where(feasible, scores, -np.inf)
+            best = int(np.argmax(masked))
+            return [available_crew[best]] if masked[best] > float('-inf') else []
+        
+        if feasible is None:
+            suitable_crew = [
+                crew for crew in available_crew
+                if self._can_crew_handle_task(crew, task, current_time)
+            ]
+            suitable_scores = [
+                self._calculate_assignment_score_with_disruption(crew, task, current_time)
+                for crew in suitable_crew
+            ]
+        else:
+            rows = np.flatnonzero(feasible)
+            suitable_crew = [available_crew[i] for i in rows]
+            suitable_scores = scores[rows].tolist()
         if not suitable_crew:
             return []
         
         if target_cleaners == 1:
             best_crew = None
             best_score = float('-inf')
-            for crew in suitable_crew:
-                score = self._calculate_assignment_score_with_disruption(crew, task, current_time)
+            for crew, score in zip(suitable_crew, suitable_scores):
                 if score > best_score:
                     best_score = score
                     best_crew = crew
             return [best_crew] if best_crew else []
         
-        from itertools import combinations
+        # The team score is mean(score_i + 5 * skill_i) + 10 * size, so the best
+        # team of each size is the top crew by score_i + 5 * skill_i; only
+        # those candidates need evaluating, not every combination
+        ranked = sorted(
+            range(len(suitable_crew)),
+            key=lambda i: -(suitable_scores[i] + 5 * suitable_crew[i].skill_level)
+        )
         
         best_combo = None
         best_score = float('-inf')
         for combo_size in range(1, min(target_cleaners + 1, len(suitable_crew) + 1)):
-            for combo in combinations(suitable_crew, combo_size):
-                score = self._calculate_team_score(list(combo), task, current_time)
-                if score > best_score:
-                    best_score = score
-                    best_combo = list(combo)
+            combo = sorted(ranked[:combo_size])
+            crew_combo = [suitable_crew[i] for i in combo]
+            score = self._calculate_team_score(
+                crew_combo, task, current_time,
+                individual_scores=[suitable_scores[i] for i in combo]
+            )
+            if score > best_score:
+                best_score = score
+                best_combo = crew_combo
         return best_combo if best_combo else []
     
-    def optimize_crew_assignment(self, current_time: float) -> Dict[str, List[str]]:
-        """Assigns crew to tasks that are ready."""
+    def optimize_crew_assignment(self, current_time: float,
+                                 t_idx: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Assigns crew to tasks that are ready. `t_idx` is the index of
+        current_time in self.time_steps, if it is a simulation step.
+        """
         assignments: Dict[str, List[str]] = {}
         
-        available_crew = [
-            crew for crew in self.crew_members
-            if self._is_crew_available(crew, current_time)
-        ]
+        available_rows = np.flatnonzero(self._available_crew_mask(current_time, t_idx))
+        if not len(available_rows):
+            return assignments
+        available_crew = [self.crew_members[i] for i in available_rows]
         
-        pending_tasks = [
-            task for task in self.cleaning_tasks
-            if (not task.assigned_crew) and (task.completion_time is None)
-            and (task.required_time <= current_time + 1800)
-        ]
-        
-        pending_tasks.sort(key=lambda t: (
-            -t.priority,
-            t.deadline - current_time if t.deadline else float('inf'),
-            -t.passenger_impact_score
-        ))
+        pending_tasks = self._get_ready_tasks(current_time)
         
+        # Crew locations and active cleanings only change in
+        # execute_assignments, so slots, scores and feasibility are fixed for
+        # the whole pass and can be computed up front for all pairs
+        candidates = []
+        slots_by_restroom: Dict[str, int] = {}
         for task in pending_tasks:
             restroom_id = task.restroom_id
-            max_cleaners = self._get_bathroom_max_cleaners(restroom_id)
-            current_cleaners = self._get_current_active_cleaners(restroom_id)
-            available_slots = max_cleaners - current_cleaners
-            if available_slots <= 0:
-                continue
-            
-            optimal_cleaners = self._determine_optimal_cleaner_count(task, current_time, available_slots)
-            best_combo = self._find_best_crew_combination(task, available_crew, optimal_cleaners, current_time)
+            available_slots = slots_by_restroom.get(restroom_id)
+            if available_slots is None:
+                max_cleaners = self._get_bathroom_max_cleaners(restroom_id)
+                current_cleaners = self._get_current_active_cleaners(restroom_id)
+                available_slots = slots_by_restroom[restroom_id] = max_cleaners - current_cleaners
+            if available_slots > 0:
+                candidates.append((task, available_slots))
+        if not candidates:
+            return assignments
+        
+        scores, feasible = self._score_matrix(
+            available_crew, [task for task, _ in candidates], current_time
+        )
+        if self.assignment_method == "hungarian":
+            return self._assign_by_matching(candidates, available_crew, scores, feasible, current_time)
+        crew_rows = list(range(len(available_crew)))
+        targets = self._optimal_cleaner_counts(candidates)
+        
+        for j, (task, _) in enumerate(candidates):
+            if not available_crew:
+                break
+            optimal_cleaners = targets[j]
+            best_combo = self._find_best_crew_combination(
+                task, available_crew, optimal_cleaners, current_time,
+                scores=scores[crew_rows, j], feasible=feasible[crew_rows, j]
+            )
             
             if best_combo:
                 task.assigned_crew = [c.crew_id for c in best_combo]
                 assignments[task.task_id] = task.assigned_crew
                 for c in best_combo:
                     if c in available_crew:
+                        del crew_rows[available_crew.index(c)]
                         available_crew.remove(c)
         
         return assignments
     
+    @staticmethod
+    def _max_score_matching(scores: np.ndarray, feasible: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        (row, col) pairs of a matching over the feasible entries that covers
+        as many columns as possible and, among those, has the highest total
+        score.
+        """
+        from scipy.optimize import linear_sum_assignment
+        
+        if not feasible.any():
+            return []
+        # Shift feasible scores to be positive and large enough that one more
+        # matched pair always outweighs any score difference
+        feasible_scores = scores[feasible]
+        spread = float(feasible_scores.max() - feasible_scores.min())
+        weight = np.where(feasible, scores - feasible_scores.min() + spread * min(scores.shape) + 1.0, 0.0)
+        rows, cols = linear_sum_assignment(weight, maximize=True)
+        keep = feasible[rows, cols]
+        return list(zip(rows[keep].tolist(), cols[keep].tolist()))
+    
+    def _assign_by_matching(self, candidates: List[Tuple[CleaningTask, int]],
+                            available_crew: List[CleaningCrewMember],
+                            scores: np.ndarray,
+                            feasible: np.ndarray,
+                            current_time: float) -> Dict[str, List[str]]:
+        """
+        optimize_crew_assignment for assignment_method='hungarian'.
+        
+        Each round solves an optimal matching of the still-free crew to the
+        tasks that want another cleaner: the first round over all candidate
+        tasks, later rounds only over tasks already staffed in an earlier
+        round whose optimal cleaner count is not reached yet.
+        """
+        targets = self._optimal_cleaner_counts(candidates)
+        teams: Dict[int, List[int]] = {}
+        free = np.ones(len(available_crew), dtype=bool)
+        open_cols = [j for j, target in enumerate(targets) if target > 0]
+        
+        while open_cols and free.any():
+            rows = np.flatnonzero(free)
+            cols = np.array(open_cols, dtype=np.intp)
+            matches = self._max_score_matching(scores[np.ix_(rows, cols)], feasible[np.ix_(rows, cols)])
+            if not matches:
+                break
+            for r, c in matches:
+                teams.setdefault(open_cols[c], []).append(int(rows[r]))
+                free[rows[r]] = False
+            open_cols = [j for j in sorted(teams) if len(teams[j]) < targets[j]]
+        
+        assignments: Dict[str, List[str]] = {}
+        for j in sorted(teams):
+            task = candidates[j][0]
+            task.assigned_crew = [available_crew[i].crew_id for i in sorted(teams[j])]
+            assignments[task.task_id] = task.assigned_crew
+        return assignments
+    
     # ---------------- TRAVEL / SCHEDULING ----------------
     
     def _calculate_travel_time(self, from_wc: str, to_wc: str) -> float:
@@ -631,7 +1304,14 @@ class CleaningCrewOptimizer:
         if from_wc == to_wc:
             return 0.0
 
-        # Normal case: look up in matrix
+        # Normal case: look up in the dense matrix
+        i = self._loc_idx.get(from_wc)
+        j = self._loc_idx.get(to_wc)
+        if i is not None and j is not None:
+            travel_time = self._tt[i, j]
+            if travel_time == travel_time:  # not NaN, i.e. pair present
+                return travel_time
+
         if from_wc not in self.travel_time_matrix:
             raise KeyError(f"Missing travel times for origin '{from_wc}' in travel_time_matrix")
 
@@ -647,26 +1327,66 @@ class CleaningCrewOptimizer:
                            restroom_id: Optional[str],
                            status: CrewStatus):
         """Append an event to this crew member's schedule (still in simulation seconds here)."""
-        self.crew_schedules[crew.crew_id].append({
-            "start": start_time,
-            "end": end_time,
-            "task_id": task_id,
-            "restroom_id": restroom_id,
-            "status": status.value
-        })
+        crew_id = crew.crew_id
+        n = self._schedule_len.get(crew_id, 0)
+        events = self._schedule_events.get(crew_id)
+        if events is None or n == len(events):
+            grown = np.empty(max(16, 2 * n), dtype=SCHEDULE_EVENT_DTYPE)
+            if events is not None:
+                grown[:n] = events
+            events = self._schedule_events[crew_id] = grown
+        events[n] = (
+            start_time,
+            end_time,
+            self._schedule_label(task_id),
+            self._schedule_label(restroom_id),
+            CREW_STATUS_ID[status],
+        )
+        self._schedule_len[crew_id] = n + 1
+    
+    def _schedule_label(self, label: Optional[str]) -> int:
+        """Intern a task / restroom id for the schedule buffers (-1 = None)."""
+        if label is None:
+            return -1
+        code = self._schedule_label_code.get(label)
+        if code is None:
+            code = self._schedule_label_code[label] = len(self._schedule_labels)
+            self._schedule_labels.append(label)
+        return code
+    
+    def finalize_schedules(self) -> Dict[str, List[Dict]]:
+        """
+        Materialise the recorded events into self.crew_schedules (the
+        documented crew_id -> list of event dicts format) and return it.
+        """
+        labels = self._schedule_labels
+        statuses = [status.value for status in CrewStatus]
+        for crew_id, events in self._schedule_events.items():
+            self.crew_schedules[crew_id] = [
+                {
+                    "start": start,
+                    "end": end,
+                    "task_id": labels[task_code] if task_code >= 0 else None,
+                    "restroom_id": labels[restroom_code] if restroom_code >= 0 else None,
+                    "status": statuses[status_code]
+                }
+                for start, end, task_code, restroom_code, status_code
+                in events[:self._schedule_len[crew_id]].tolist()
+            ]
+        return self.crew_schedules
     
     def execute_assignments(self, assignments: Dict[str, List[str]], current_time: float):
         """Execute crew assignments, update status, and log schedule events."""
         for task_id, crew_ids in assignments.items():
-            task = next(t for t in self.cleaning_tasks if t.task_id == task_id)
+            task = self._get_task(task_id)
+            num_cleaners = len(crew_ids)
+            adjusted_duration = task.estimated_duration / self._get_team_speedup(num_cleaners)
             
             for crew_id in crew_ids:
-                crew = next(c for c in self.crew_members if c.crew_id == crew_id)
+                crew = self._crew_by_id[crew_id]
+                self._tasks_by_crew[crew_id][task_id] = task
                 travel_time = self._calculate_travel_time(crew.current_location, task.restroom_id)
                 
-                num_cleaners = len(crew_ids)
-                adjusted_duration = task.estimated_duration / (num_cleaners ** 0.7)
-                
                 end_time = current_time + travel_time + (adjusted_duration * 60)
                 
                 # Log the event (one block including travel+cleaning)
@@ -682,11 +1402,15 @@ class CleaningCrewOptimizer:
                 crew.status = CrewStatus.TRAVELING if travel_time > 0 else CrewStatus.CLEANING
                 crew.current_task_end_time = end_time
                 crew.current_location = task.restroom_id
+                self._sync_crew_row(crew)
             
             # Track active cleaning for capacity
-            if task.restroom_id not in self.active_cleanings:
-                self.active_cleanings[task.restroom_id] = []
-            self.active_cleanings[task.restroom_id].append(task_id)
+            restroom_id = task.restroom_id
+            active = self.active_cleanings.get(restroom_id)
+            if active is None:
+                active = self.active_cleanings[restroom_id] = Counter()
+            active[task_id] += 1
+            self._active_cleaning_count[restroom_id] = self._active_cleaning_count.get(restroom_id, 0) + 1
             
             # No demand model → disruption_cost stays 0
             task.disruption_cost = 0.0
@@ -694,44 +1418,65 @@ class CleaningCrewOptimizer:
     
     def update_crew_status(self, current_time: float):
         """Update crew status based on current time and finish tasks."""
-        for crew in self.crew_members:
-            if crew.current_task_end_time > 0 and current_time >= crew.current_task_end_time:
-                completed_task = None
-                for task in self.cleaning_tasks:
-                    if (task.assigned_crew and crew.crew_id in task.assigned_crew
-                        and task.completion_time is None):
-                        completed_task = task
-                        break
+        end_times = self.crew_task_end_time
+        crew_row = self._crew_row
+        finished_rows = np.flatnonzero((end_times > 0) & (end_times <= current_time))
+        for i in finished_rows.tolist():
+            crew = self.crew_members[i]
+            completed_task = self._current_task_of(crew)
+            
+            if completed_task:
+                # Task is done once every crew member on it is done
+                all_finished = not any(
+                    end_times[crew_row[cid]] > current_time
+                    for cid in completed_task.assigned_crew
+                )
                 
-                if completed_task:
-                    # Check if all crew on that task are done
-                    all_finished = True
-                    for cid in completed_task.assigned_crew:
-                        c = next(x for x in self.crew_members if x.crew_id == cid)
-                        if c.current_task_end_time > current_time:
-                            all_finished = False
-                            break
+                if all_finished:
+                    completed_task.completion_time = current_time
+                    if completed_task.task_id not in self._completed_ids:
+                        self._mark_completed(completed_task)
                     
-                    if all_finished:
-                        completed_task.completion_time = current_time
-                        if completed_task not in self.completed_tasks:
-                            self.completed_tasks.append(completed_task)
-                        
-                        if completed_task.restroom_id in self.active_cleanings:
-                            if completed_task.task_id in self.active_cleanings[completed_task.restroom_id]:
-                                self.active_cleanings[completed_task.restroom_id].remove(completed_task.task_id)
-                            if not self.active_cleanings[completed_task.restroom_id]:
-                                del self.active_cleanings[completed_task.restroom_id]
-                
-                crew.status = CrewStatus.IDLE
-                crew.current_task_end_time = 0.0
-                if completed_task:
-                    adjusted_duration = completed_task.estimated_duration / len(completed_task.assigned_crew)
-                    crew.total_work_time += adjusted_duration
-                    self._consume_supplies(crew, completed_task)
-                    self.last_cleaning_time[completed_task.restroom_id] = current_time
-                    if crew.supplies_remaining < self.supplies_per_cleaning:
-                        self._restock_crew_supplies(crew, current_time)
+                    self._end_active_cleaning(completed_task)
+            
+            crew.status = CrewStatus.IDLE
+            crew.current_task_end_time = 0.0
+            if completed_task:
+                adjusted_duration = completed_task.estimated_duration / len(completed_task.assigned_crew)
+                crew.total_work_time += adjusted_duration
+                self._consume_supplies(crew, completed_task)
+                self.last_cleaning_time[completed_task.restroom_id] = current_time
+                if crew.supplies_remaining < self.supplies_per_cleaning:
+                    self._restock_crew_supplies(crew, current_time)
+            self._sync_crew_row(crew)
+
+    def _end_active_cleaning(self, task: CleaningTask):
+        """Drop one start of task from active_cleanings (if any)."""
+        restroom_id = task.restroom_id
+        active = self.active_cleanings.get(restroom_id)
+        if active is None:
+            return
+        if active.get(task.task_id):
+            active[task.task_id] -= 1
+            if not active[task.task_id]:
+                del active[task.task_id]
+            self._active_cleaning_count[restroom_id] -= 1
+        if not active:
+            del self.active_cleanings[restroom_id]
+            self._active_cleaning_count.pop(restroom_id, None)
+    
+    def _mark_completed(self, task: CleaningTask):
+        """Append task to completed_tasks and the completed partitions."""
+        self._completed_ids.add(task.task_id)
+        self.completed_tasks.append(task)
+        self._completed_by_type[task.cleaning_type].append(task)
+        if task.cleaning_type in URGENT_CLEANING_TYPES:
+            self._completed_urgent.append(task)
+        if task.priority >= 4:
+            self._completed_high_priority.append(task)
+        prefix, sep, _ = str(task.task_id).partition('_')
+        if sep:
+            self._completed_by_prefix[prefix] += 1
     
     # ---------------- EMERGENCIES / CALL-INS (WAIT-BASED) ----------------
     
@@ -740,175 +1485,173 @@ class CleaningCrewOptimizer:
         Create call-in / emergency tasks based on waiting times only.
         """
         new_urgent_tasks: List[CleaningTask] = []
-        if not hasattr(self, 'waiting_time_data'):
+        if self.waiting_time_data is None:
+            return new_urgent_tasks
+        if self._max_wait_by_step is None:
+            self._stack_waiting_times()
+        if t_idx >= len(self._max_wait_by_step):
             return new_urgent_tasks
         
-        w_r = self.waiting_time_data
+        if not self._call_in_steps[t_idx]:
+            return new_urgent_tasks
         
-        for restroom_id in self.restrooms.keys():
-            max_waiting_time = 0.0
-            for gender in ['M', 'F']:
-                section_id = f"{restroom_id}-{gender}"
-                if section_id in w_r and t_idx < len(w_r[section_id]):
-                    max_waiting_time = max(max_waiting_time, w_r[section_id][t_idx])
+        # Trigger thresholds (applied in _stack_waiting_times): wait > 640s is
+        # an emergency (priority 5), > 480s / > 360s a call-in (priority 4 / 3)
+        step_waits = self._max_wait_by_step[t_idx]
+        step_priorities = self._call_in_priority_by_step[t_idx]
+        triggered = np.flatnonzero(step_priorities)
+        impacts = self._call_in_impact_by_step[t_idx, triggered]
+        for j, impact in zip(triggered, impacts.tolist()):
+            restroom_id = self._wait_restroom_ids[j]
+            max_waiting_time = step_waits[j]
+            priority = int(step_priorities[j])
+            emergency_triggered = priority == 5
+            task_type = CleaningType.EMERGENCY if emergency_triggered else CleaningType.CALL_IN
             
-            if max_waiting_time <= 0:
+            if self._has_recent_urgent_task(restroom_id, current_time):
                 continue
             
-            emergency_triggered = False
-            call_in_triggered = False
-            priority = 1
-            task_type = CleaningType.CALL_IN
+            if emergency_triggered:
+                task_id = f"EMERGENCY_{self.emergency_task_counter:04d}"
+                self.emergency_task_counter += 1
+            else:
+                task_id = f"CALLIN_{self.call_in_task_counter:04d}"
+                self.call_in_task_counter += 1
             
-            # These thresholds can be adjusted; currently set to larger values
-            if max_waiting_time > 640:
-                emergency_triggered = True
-                priority = 5
-                task_type = CleaningType.EMERGENCY
-            elif max_waiting_time > 480:
-                call_in_triggered = True
-                priority = 4
-            elif max_waiting_time > 360:
-                call_in_triggered = True
-                priority = 3
+            deadline = current_time + (1800 if emergency_triggered else 3600)
             
-            if emergency_triggered or call_in_triggered:
-                recent_urgent = [
-                    t for t in self.cleaning_tasks
-                    if (t.restroom_id == restroom_id and t.priority >= 3
-                        and abs(t.created_time - current_time) < 1800
-                        and t.completion_time is None)
-                ]
-                if recent_urgent:
-                    continue
-                
-                if emergency_triggered:
-                    task_id = f"EMERGENCY_{self.emergency_task_counter:04d}"
-                    self.emergency_task_counter += 1
-                else:
-                    task_id = f"CALLIN_{self.call_in_task_counter:04d}"
-                    self.call_in_task_counter += 1
-                
-                deadline = current_time + (1800 if emergency_triggered else 3600)
-                
-                urgent_task = CleaningTask(
-                    task_id=task_id,
-                    restroom_id=restroom_id,
-                    cleaning_type=task_type,
-                    priority=priority,
-                    estimated_duration=self.cleaning_durations[task_type],
-                    required_time=current_time,
-                    deadline=deadline,
-                    created_time=current_time,
-                    assigned_crew=[],
-                    passenger_impact_score=self._calculate_passenger_impact(
-                        arrival_rate=0.0,
-                        queue_length=0.0,
-                        waiting_time=max_waiting_time
-                    )
-                )
-                new_urgent_tasks.append(urgent_task)
-                
-                print(f"  URGENT: {task_type.value.title()} at {restroom_id} (Priority {priority}) - "
+            urgent_task = CleaningTask(
+                task_id=task_id,
+                restroom_id=restroom_id,
+                cleaning_type=task_type,
+                priority=priority,
+                estimated_duration=float(self._duration_by_type[CLEANING_TYPE_ID[task_type]]),
+                required_time=current_time,
+                deadline=deadline,
+                created_time=current_time,
+                assigned_crew=[],
+                passenger_impact_score=impact
+            )
+            new_urgent_tasks.append(urgent_task)
+            
+            self._log(f"  URGENT: {task_type.value.title()} at {restroom_id} (Priority {priority}) - "
                       f"Wait: {max_waiting_time:.0f}s")
         
         return new_urgent_tasks
     
     def _find_preemptable_crew(self, urgent_task: CleaningTask,
-                               current_time: float) -> Optional[CleaningCrewMember]:
-        candidates = []
-        for crew in self.crew_members:
-            if crew.status not in [CrewStatus.CLEANING, CrewStatus.TRAVELING]:
+                               current_time: float
+                               ) -> Optional[Tuple[CleaningCrewMember, CleaningTask]]:
+        """
+        Busy crew member whose current task has the lowest priority below
+        urgent_task's and who can handle urgent_task, as (crew, current task).
+        """
+        # Busy crew keyed by (current task priority, crew order); the first
+        # one popped that can handle urgent_task is the victim
+        victims = []
+        for i, crew in enumerate(self.crew_members):
+            if crew.status not in PREEMPTABLE_STATUSES:
                 continue
-            current_task = None
-            for task in self.cleaning_tasks:
-                if (task.assigned_crew and crew.crew_id in task.assigned_crew
-                    and task.completion_time is None):
-                    current_task = task
-                    break
+            current_task = self._current_task_of(crew)
             if current_task and current_task.priority < urgent_task.priority:
-                if self._can_crew_handle_task(crew, urgent_task, current_time):
-                    candidates.append((crew, current_task))
-        if candidates:
-            return min(candidates, key=lambda x: x[1].priority)[0]
+                victims.append((current_task.priority, i, crew, current_task))
+        heapq.heapify(victims)
+        while victims:
+            _, _, crew, current_task = heapq.heappop(victims)
+            if self._can_crew_handle_task(crew, urgent_task, current_time):
+                return crew, current_task
         return None
     
     def _preempt_crew_task(self, crew: CleaningCrewMember,
                            urgent_task: CleaningTask,
-                           current_time: float):
-        for task in self.cleaning_tasks:
-            if (task.assigned_crew and crew.crew_id in task.assigned_crew
-                and task.completion_time is None):
-                task.assigned_crew.remove(crew.crew_id)
-                if not task.assigned_crew:
-                    task.assigned_crew = []
-                    task.required_time = current_time + 1800
-                    setattr(task, "_was_preempted", True)
-                    print(f"      Rescheduled interrupted task: {task.task_id}")
-                break
+                           current_time: float,
+                           current_task: Optional[CleaningTask] = None):
+        """
+        Take crew off its current task (looked up unless passed in) and
+        assign it to urgent_task; a task left with no crew is re-queued.
+        """
+        task = current_task if current_task is not None else self._current_task_of(crew)
+        if task:
+            task.assigned_crew.remove(crew.crew_id)
+            if not task.assigned_crew:
+                task.assigned_crew = []
+                task.required_time = current_time + 1800
+                task.was_preempted = True
+                self._queue_task(task)
+                self._log(f"      Rescheduled interrupted task: {task.task_id}")
         
         urgent_task.assigned_crew = [crew.crew_id]
         self.execute_assignments({urgent_task.task_id: [crew.crew_id]}, current_time)
-        print(f"      Successfully assigned {crew.name} to urgent task {urgent_task.task_id}")
+        self._log(f"      Successfully assigned {crew.name} to urgent task {urgent_task.task_id}")
+    
+    def _best_crew_for_task(self, crews: List[CleaningCrewMember],
+                            task: CleaningTask,
+                            current_time: float) -> Optional[CleaningCrewMember]:
+        """
+        Highest scoring crew member (first on ties) among those in crews that
+        can handle task, or None. Scores all candidates in one _score_matrix
+        call; equivalent to max(...) over _calculate_assignment_score_with_disruption.
+        """
+        if not crews:
+            return None
+        scores, feasible = self._score_matrix(crews, [task], current_time)
+        candidates = np.flatnonzero(feasible[:, 0])
+        if not len(candidates):
+            return None
+        return crews[int(candidates[scores[candidates, 0].argmax()])]
     
     def _handle_crew_reassignment(self, urgent_tasks: List[CleaningTask],
                                   current_time: float):
         for urgent_task in urgent_tasks:
-            print(f"    Handling urgent task: {urgent_task.task_id}")
+            self._log(f"    Handling urgent task: {urgent_task.task_id}")
             
-            idle_crew = [
-                crew for crew in self.crew_members
-                if (crew.status == CrewStatus.IDLE
-                    and self._is_crew_available(crew, current_time)
-                    and self._can_crew_handle_task(crew, urgent_task, current_time))
+            available = self._available_crew_mask(current_time)
+            idle = available & (self.crew_status == STATUS_IDLE)
+            available_crew = [
+                crew for crew, ok in zip(self.crew_members, available.tolist()) if ok
             ]
+            idle_crew = [crew for crew, ok in zip(self.crew_members, idle.tolist()) if ok]
+            best_idle = self._best_crew_for_task(idle_crew, urgent_task, current_time)
             
-            if idle_crew:
-                best_idle = max(
-                    idle_crew,
-                    key=lambda c: self._calculate_assignment_score_with_disruption(c, urgent_task, current_time)
-                )
+            if best_idle is not None:
                 urgent_task.assigned_crew = [best_idle.crew_id]
                 self.execute_assignments({urgent_task.task_id: [best_idle.crew_id]}, current_time)
-                print(f"    Assigned to idle crew: {best_idle.name}")
+                self._log(f"    Assigned to idle crew: {best_idle.name}")
                 continue
             
-            available_crew = [
-                crew for crew in self.crew_members
-                if (self._is_crew_available(crew, current_time)
-                    and self._can_crew_handle_task(crew, urgent_task, current_time))
-            ]
+            best_crew = self._best_crew_for_task(available_crew, urgent_task, current_time)
             
-            if available_crew and urgent_task.priority >= 4:
-                best_crew = max(
-                    available_crew,
-                    key=lambda c: self._calculate_assignment_score_with_disruption(c, urgent_task, current_time)
-                )
+            if best_crew is not None and urgent_task.priority >= 4:
                 if best_crew.status != CrewStatus.IDLE:
                     self._preempt_crew_task(best_crew, urgent_task, current_time)
-                    print(f"    Preempted {best_crew.name} for urgent task")
+                    self._log(f"    Preempted {best_crew.name} for urgent task")
                 else:
                     urgent_task.assigned_crew = [best_crew.crew_id]
                     self.execute_assignments({urgent_task.task_id: [best_crew.crew_id]}, current_time)
-                    print(f"    Assigned to crew: {best_crew.name}")
+                    self._log(f"    Assigned to crew: {best_crew.name}")
                 continue
             
             if urgent_task.priority >= 4:
                 preemptable = self._find_preemptable_crew(urgent_task, current_time)
                 if preemptable:
-                    self._preempt_crew_task(preemptable, urgent_task, current_time)
-                    print(f"    Preempted {preemptable.name} for urgent task")
+                    preempted_crew, current_task = preemptable
+                    self._preempt_crew_task(preempted_crew, urgent_task, current_time, current_task)
+                    self._log(f"    Preempted {preempted_crew.name} for urgent task")
                 else:
-                    print(f"    No available crew for urgent task: {urgent_task.task_id}")
+                    self._log(f"    No available crew for urgent task: {urgent_task.task_id}")
             else:
-                print(f"    No available crew for urgent task: {urgent_task.task_id}")
+                self._log(f"    No available crew for urgent task: {urgent_task.task_id}")
     
     # ---------------- SUPPLIES & COSTS ----------------
     
     def _calculate_restock_time(self, crew: CleaningCrewMember) -> float:
-        travel_time = self._calculate_travel_time(crew.current_location, self.supply_depot_location)
-        return_time = self._calculate_travel_time(self.supply_depot_location, crew.current_location)
-        return travel_time + self.restock_time + return_time
+        restock_time = self._restock_time_by_loc.get(crew.current_location)
+        if restock_time is None:
+            travel_time = self._calculate_travel_time(crew.current_location, self.supply_depot_location)
+            return_time = self._calculate_travel_time(self.supply_depot_location, crew.current_location)
+            restock_time = travel_time + self.restock_time + return_time
+            self._restock_time_by_loc[crew.current_location] = restock_time
+        return restock_time
     
     def _restock_crew_supplies(self, crew: CleaningCrewMember, current_time: float):
         restock_time = self._calculate_restock_time(crew)
@@ -929,96 +1672,86 @@ class CleaningCrewOptimizer:
         crew.supplies_remaining = 100.0
         crew.last_restock_time = current_time
         
-        if not hasattr(self, 'total_restock_cost'):
-            self.total_restock_cost = 0.0
         self.total_restock_cost += self.restock_cost
     
     def _consume_supplies(self, crew: CleaningCrewMember, task: CleaningTask):
-        supplies_used = self.supplies_per_cleaning
-        if task.cleaning_type == CleaningType.DEEP_CLEAN:
-            supplies_used *= 2.0
-        elif task.cleaning_type == CleaningType.EMERGENCY:
-            supplies_used *= 1.5
+        supplies_used = float(self._supplies_needed_by_type[task.cleaning_type_id])
         crew.supplies_remaining = max(0.0, crew.supplies_remaining - supplies_used)
     
     # ---------------- KPIs & SUMMARIES ----------------
     
+    def _record_kpis(self, t_idx: int, kpis: Dict[str, float]):
+        """Store all KPI samples taken at time step t_idx as one history row."""
+        self._kpi_matrix[t_idx // self._kpi_interval] = [kpis[name] for name in self._kpi_names]
+    
+    def _crew_labor_costs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-crew overtime hours, regular cost and overtime cost (rows aligned
+        with crew_members). Hours beyond the scheduled shift hours over the
+        simulation are paid at the overtime multiplier. Callers accumulate
+        the rows in crew order so totals match a per-crew running sum.
+        """
+        hours_worked = np.fromiter((c.total_work_time for c in self.crew_members),
+                                   dtype=np.float64, count=len(self.crew_members)) / 60.0
+        total_days = self.simulation_duration / (24.0 * 3600.0)
+        scheduled_hours = self.crew_shift_hours * total_days
+        overtime = hours_worked > scheduled_hours
+        overtime_hours = np.where(overtime, hours_worked - scheduled_hours, 0.0)
+        regular_cost = np.where(overtime, scheduled_hours, hours_worked) * self.crew_rate
+        overtime_cost = np.where(overtime, overtime_hours * self.crew_rate * self.overtime_multiplier, 0.0)
+        return overtime_hours, regular_cost, overtime_cost
+    
+    @staticmethod
+    def _mean_response_minutes(tasks: List[CleaningTask]) -> float:
+        """
+        Mean minutes from creation to completion over the tasks created after
+        time 0 and completed no earlier than created (0.0 if there are none).
+        """
+        n = len(tasks)
+        created = np.fromiter((t.created_time for t in tasks), dtype=np.float64, count=n)
+        completion = np.fromiter(
+            (np.nan if t.completion_time is None else t.completion_time for t in tasks),
+            dtype=np.float64, count=n
+        )
+        valid = (created > 0) & (completion >= created)
+        if not valid.any():
+            return 0.0
+        return float(np.mean((completion[valid] - created[valid]) / 60.0))
+    
     def calculate_kpis(self, current_time: float) -> Dict[str, float]:
         kpis: Dict[str, float] = {}
         
         # 1. Cost
+        overtime_hours, regular_cost, overtime_cost = self._crew_labor_costs()
         total_cost = 0.0
-        total_days = self.simulation_duration / (24.0 * 3600.0)
-        for crew in self.crew_members:
-            hours_worked = crew.total_work_time / 60.0
-            shift_duration_per_day = (crew.shift_end - crew.shift_start) / 3600.0
-            scheduled_hours = shift_duration_per_day * total_days
-            if hours_worked <= scheduled_hours:
-                total_cost += hours_worked * crew.hourly_rate
-            else:
-                regular_cost = scheduled_hours * crew.hourly_rate
-                overtime_hours = hours_worked - scheduled_hours
-                overtime_cost = overtime_hours * crew.hourly_rate * self.overtime_multiplier
-                total_cost += regular_cost + overtime_cost
+        for crew_cost in (regular_cost + overtime_cost).tolist():
+            total_cost += crew_cost
         
         total_cost += len(self.completed_tasks) * self.supply_cost_per_cleaning
-        if hasattr(self, 'total_restock_cost'):
-            total_cost += self.total_restock_cost
+        total_cost += self.total_restock_cost
         kpis['total_cost'] = total_cost
         
+        completion_kpis = self._completed_task_kpis()
+        
         # 2. Avg response for urgent tasks
-        urgent_tasks = [
-            t for t in self.completed_tasks
-            if t.cleaning_type in [CleaningType.CALL_IN, CleaningType.EMERGENCY]
-            and t.created_time > 0 and t.completion_time is not None
-            and t.completion_time >= t.created_time
-        ]
-        if urgent_tasks:
-            response_times = [(t.completion_time - t.created_time) / 60.0 for t in urgent_tasks]
-            kpis['avg_response_time'] = float(np.mean(response_times))
-        else:
-            kpis['avg_response_time'] = 0.0
+        kpis['avg_response_time'] = completion_kpis['avg_response_time']
         
         # 3. Passenger satisfaction
-        satisfaction_scores = []
-        for task in self.completed_tasks:
-            base_satisfaction = 85.0
-            if task.deadline and task.completion_time and task.completion_time > task.deadline:
-                delay_minutes = (task.completion_time - task.deadline) / 60.0
-                penalty = min(delay_minutes * 2.0, 40.0)
-                base_satisfaction -= penalty
-            if task.assigned_crew:
-                skills = []
-                for cid in task.assigned_crew:
-                    c = next(x for x in self.crew_members if x.crew_id == cid)
-                    skills.append(c.skill_level)
-                avg_skill = sum(skills) / len(skills)
-                base_satisfaction += (avg_skill - 1.0) * 10.0
-            satisfaction_scores.append(max(0.0, min(100.0, base_satisfaction)))
-        kpis['passenger_satisfaction'] = float(np.mean(satisfaction_scores)) if satisfaction_scores else 85.0
+        kpis['passenger_satisfaction'] = completion_kpis['passenger_satisfaction']
         
         # 4. Crew utilisation
         seconds_per_day = 24.0 * 3600.0
         time_in_day = current_time % seconds_per_day
-        active_crew = sum(
-            1 for c in self.crew_members
-            if c.shift_start <= time_in_day <= c.shift_end
+        active_crew = np.count_nonzero(
+            (self.crew_shift_start <= time_in_day) & (time_in_day <= self.crew_shift_end)
+        )
+        busy_crew = np.count_nonzero(
+            (self.crew_status == STATUS_CLEANING) | (self.crew_status == STATUS_TRAVELING)
         )
-        busy_crew = sum(1 for c in self.crew_members if c.status in [CrewStatus.CLEANING, CrewStatus.TRAVELING])
         kpis['crew_utilization'] = (busy_crew / active_crew * 100.0) if active_crew > 0 else 0.0
         
         # 5. Emergency response time
-        emergency_tasks = [
-            t for t in self.completed_tasks
-            if t.cleaning_type == CleaningType.EMERGENCY
-            and t.created_time > 0 and t.completion_time is not None
-            and t.completion_time >= t.created_time
-        ]
-        if emergency_tasks:
-            rts = [(t.completion_time - t.created_time) / 60.0 for t in emergency_tasks]
-            kpis['emergency_response_time'] = float(np.mean(rts))
-        else:
-            kpis['emergency_response_time'] = 0.0
+        kpis['emergency_response_time'] = completion_kpis['emergency_response_time']
         
         # 6. Task completion rate
         total_tasks = len(self.cleaning_tasks)
@@ -1026,45 +1759,121 @@ class CleaningCrewOptimizer:
         kpis['task_completion_rate'] = (completed_tasks / total_tasks * 100.0) if total_tasks > 0 else 100.0
         
         # 7. Overtime hours
-        overtime_hours = 0.0
-        for c in self.crew_members:
-            shift_duration_per_day = (c.shift_end - c.shift_start) / 3600.0
-            scheduled_hours = shift_duration_per_day * total_days
-            hours_worked = c.total_work_time / 60.0
-            if hours_worked > scheduled_hours:
-                overtime_hours += (hours_worked - scheduled_hours)
-        kpis['overtime_hours'] = overtime_hours
+        kpis['overtime_hours'] = 0.0
+        for crew_overtime in overtime_hours.tolist():
+            kpis['overtime_hours'] += crew_overtime
         
         # 8. Cleaning quality score
-        quality_scores = []
-        for task in self.completed_tasks:
-            if task.assigned_crew:
-                skills = []
-                for cid in task.assigned_crew:
-                    c = next(x for x in self.crew_members if x.crew_id == cid)
-                    skills.append(c.skill_level)
-                avg_skill = sum(skills) / len(skills)
-            else:
-                avg_skill = 1.5
-            base_quality = 60 + avg_skill * 20
-            if task.cleaning_type == CleaningType.ROUTINE:
-                expected = self.cleaning_durations[CleaningType.ROUTINE]
-                if task.estimated_duration >= expected:
-                    base_quality += 5
-            quality_scores.append(min(100.0, base_quality))
-        kpis['cleaning_quality_score'] = float(np.mean(quality_scores)) if quality_scores else 80.0
+        kpis['cleaning_quality_score'] = completion_kpis['cleaning_quality_score']
         
         # 9. Disruption cost
-        total_disruption_cost = sum(t.disruption_cost for t in self.completed_tasks)
-        kpis['disruption_cost'] = total_disruption_cost
+        kpis['disruption_cost'] = completion_kpis['disruption_cost']
         
         # 10. Average capacity reduction
-        if self.completed_tasks:
-            avg_cap_red = np.mean([t.capacity_reduction * 100.0 for t in self.completed_tasks])
+        kpis['avg_capacity_reduction'] = completion_kpis['avg_capacity_reduction']
+        
+        return kpis
+    
+    @staticmethod
+    def _empty_completed_kpi_cache() -> Dict:
+        empty = np.zeros(0, dtype=np.float64)
+        return {
+            'n': 0, 'last': None, 'kpis': None,
+            'deadline': empty, 'completion': empty, 'avg_skill': empty,
+            'full_routine': np.zeros(0, dtype=bool), 'capacity_reduction': empty,
+            'disruption_cost': 0
+        }
+    
+    def _completed_task_kpis(self) -> Dict[str, float]:
+        """
+        The KPIs that depend only on completed tasks (response times,
+        satisfaction, quality, disruption, capacity reduction). Per task
+        inputs are read once, when the task first shows up in
+        completed_tasks, and the KPIs are reused until another task
+        completes; the cache is rebuilt if completed_tasks was replaced.
+        """
+        completed = self.completed_tasks
+        n_completed = len(completed)
+        cache = self._completed_kpi_cache
+        n_cached = cache['n']
+        if n_cached > n_completed or (n_cached and completed[n_cached - 1] is not cache['last']):
+            cache = self._completed_kpi_cache = self._empty_completed_kpi_cache()
+            n_cached = 0
+        if cache['kpis'] is not None and n_cached == n_completed:
+            return cache['kpis']
+        
+        # Per completed task fields shared by the satisfaction, quality and
+        # capacity KPIs (tasks without crew get avg_skill NaN)
+        new = completed[n_cached:]
+        n_new = len(new)
+        expected_routine = self._duration_by_type[TYPE_ROUTINE]
+        
+        # Mean crew skill per task: one flat array of crew rows over all new
+        # tasks, summed per task with np.add.reduceat
+        team_size = np.fromiter((len(t.assigned_crew) if t.assigned_crew else 0 for t in new),
+                                dtype=np.intp, count=n_new)
+        crew_row = self._crew_row
+        rows = np.fromiter((crew_row[cid] for t in new if t.assigned_crew for cid in t.assigned_crew),
+                           dtype=np.intp, count=int(team_size.sum()))
+        avg_skill = np.full(n_new, np.nan)
+        has_team = team_size > 0
+        if has_team.any():
+            sizes = team_size[has_team]
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            avg_skill[has_team] = np.add.reduceat(self.crew_skill[rows], starts) / sizes
+        
+        fields = {
+            'deadline': np.fromiter((t.deadline or 0.0 for t in new), dtype=np.float64, count=n_new),
+            'completion': np.fromiter((t.completion_time or 0.0 for t in new), dtype=np.float64, count=n_new),
+            'avg_skill': avg_skill,
+            'full_routine': np.fromiter(
+                (t.cleaning_type_id == TYPE_ROUTINE and t.estimated_duration >= expected_routine
+                 for t in new),
+                dtype=bool, count=n_new
+            ),
+            'capacity_reduction': np.fromiter((t.capacity_reduction for t in new),
+                                              dtype=np.float64, count=n_new),
+        }
+        for name, values in fields.items():
+            cache[name] = np.concatenate((cache[name], values)) if n_cached else values
+        for t in new:
+            cache['disruption_cost'] += t.disruption_cost
+        cache['n'] = n_completed
+        cache['last'] = completed[-1] if completed else None
+        
+        deadline = cache['deadline']
+        completion = cache['completion']
+        avg_skill = cache['avg_skill']
+        has_crew = ~np.isnan(avg_skill)
+        kpis: Dict[str, float] = {}
+        
+        kpis['avg_response_time'] = self._mean_response_minutes(self._completed_urgent)
+        
+        late = (deadline != 0.0) & (completion != 0.0) & (completion > deadline)
+        penalty = np.where(late, np.minimum((completion - deadline) / 60.0 * 2.0, 40.0), 0.0)
+        skill_bonus = np.where(has_crew, (avg_skill - 1.0) * 10.0, 0.0)
+        satisfaction_scores = np.clip((85.0 - penalty) + skill_bonus, 0.0, 100.0)
+        kpis['passenger_satisfaction'] = float(satisfaction_scores.mean()) if n_completed else 85.0
+        
+        kpis['emergency_response_time'] = self._mean_response_minutes(
+            self._completed_by_type[CleaningType.EMERGENCY]
+        )
+        
+        quality_scores = np.minimum(
+            (60.0 + np.where(has_crew, avg_skill, 1.5) * 20.0) + np.where(cache['full_routine'], 5.0, 0.0),
+            100.0
+        )
+        kpis['cleaning_quality_score'] = float(quality_scores.mean()) if n_completed else 80.0
+        
+        kpis['disruption_cost'] = cache['disruption_cost']
+        
+        if n_completed:
+            avg_cap_red = np.mean(cache['capacity_reduction'] * 100.0)
         else:
             avg_cap_red = 0.0
         kpis['avg_capacity_reduction'] = avg_cap_red
         
+        cache['kpis'] = kpis
         return kpis
     
     def _calculate_cost_breakdown(self) -> Dict:
@@ -1073,23 +1882,15 @@ class CleaningCrewOptimizer:
             'overtime_cost': 0.0,
             'supply_cost': 0.0,
             'emergency_cost': 0.0,
-            'restock_cost': getattr(self, 'total_restock_cost', 0.0)
+            'restock_cost': self.total_restock_cost
         }
-        total_days = self.simulation_duration / (24.0 * 3600.0)
-        for c in self.crew_members:
-            hours_worked = c.total_work_time / 60.0
-            shift_duration_per_day = (c.shift_end - c.shift_start) / 3600.0
-            scheduled_hours = shift_duration_per_day * total_days
-            if hours_worked <= scheduled_hours:
-                breakdown['labor_cost'] += hours_worked * c.hourly_rate
-            else:
-                breakdown['labor_cost'] += scheduled_hours * c.hourly_rate
-                overtime_hours = hours_worked - scheduled_hours
-                breakdown['overtime_cost'] += overtime_hours * c.hourly_rate * self.overtime_multiplier
+        _, regular_cost, overtime_cost = self._crew_labor_costs()
+        for crew_regular, crew_overtime in zip(regular_cost.tolist(), overtime_cost.tolist()):
+            breakdown['labor_cost'] += crew_regular
+            breakdown['overtime_cost'] += crew_overtime
         
         breakdown['supply_cost'] = len(self.completed_tasks) * self.supply_cost_per_cleaning
-        emergency_tasks = [t for t in self.completed_tasks if t.priority >= 4]
-        breakdown['emergency_cost'] = len(emergency_tasks) * self.supply_cost_per_cleaning * self.emergency_cost_multiplier
+        breakdown['emergency_cost'] = len(self._completed_high_priority) * self.supply_cost_per_cleaning * self.emergency_cost_multiplier
         return breakdown
     
     def _calculate_efficiency_score(self, crew: CleaningCrewMember,
@@ -1100,7 +1901,7 @@ class CleaningCrewOptimizer:
         score += len(tasks) * 2
         emergency_tasks = [t for t in tasks if t.priority >= 4]
         score += len(emergency_tasks) * 5
-        shift_duration_per_day = (crew.shift_end - crew.shift_start) / 3600.0
+        shift_duration_per_day = float(self.crew_shift_hours[self._crew_row[crew.crew_id]])
         total_days = self.simulation_duration / (24.0 * 3600.0)
         scheduled_hours = shift_duration_per_day * total_days
         hours_worked = crew.total_work_time / 60.0
@@ -1111,11 +1912,14 @@ class CleaningCrewOptimizer:
     
     def _analyze_crew_performance(self) -> Dict:
         performance = {}
+        # One pass over completed tasks, bucketed by crew id via _crew_by_id
+        completed_by_crew: Dict[str, List[CleaningTask]] = {cid: [] for cid in self._crew_by_id}
+        for t in self.completed_tasks:
+            for cid in dict.fromkeys(t.assigned_crew or ()):
+                if cid in completed_by_crew:
+                    completed_by_crew[cid].append(t)
         for crew in self.crew_members:
-            tasks_completed = [
-                t for t in self.completed_tasks
-                if t.assigned_crew and crew.crew_id in t.assigned_crew
-            ]
+            tasks_completed = completed_by_crew[crew.crew_id]
             performance[crew.crew_id] = {
                 'name': crew.name,
                 'tasks_completed': len(tasks_completed),
@@ -1128,14 +1932,19 @@ class CleaningCrewOptimizer:
     def _summarize_tasks(self) -> Dict:
         total_tasks = len(self.cleaning_tasks)
         completed_tasks = len(self.completed_tasks)
+        type_totals = Counter()
+        preempted_tasks = 0
+        for t in self.cleaning_tasks:
+            type_totals[t.cleaning_type] += 1
+            preempted_tasks += t.was_preempted
         task_types = {}
         for task_type in CleaningType:
-            type_tasks = [t for t in self.cleaning_tasks if t.cleaning_type == task_type]
-            completed_type_tasks = [t for t in self.completed_tasks if t.cleaning_type == task_type]
+            type_total = type_totals[task_type]
+            type_completed = len(self._completed_by_type[task_type])
             task_types[task_type.value] = {
-                'total': len(type_tasks),
-                'completed': len(completed_type_tasks),
-                'completion_rate': (len(completed_type_tasks) / len(type_tasks) * 100.0) if type_tasks else 0.0
+                'total': type_total,
+                'completed': type_completed,
+                'completion_rate': (type_completed / type_total * 100.0) if type_total else 0.0
             }
         return {
             'total_tasks': total_tasks,
@@ -1143,14 +1952,14 @@ class CleaningCrewOptimizer:
             'overall_completion_rate': (completed_tasks / total_tasks * 100.0) if total_tasks > 0 else 0.0,
             'by_type': task_types,
             'avg_passenger_impact': float(np.mean([t.passenger_impact_score for t in self.completed_tasks])) if self.completed_tasks else 0.0,
-            'usage_based_cleanings': len([t for t in self.completed_tasks if str(t.task_id).startswith('USAGE_')]),
-            'real_time_call_ins': len([t for t in self.completed_tasks if str(t.task_id).startswith('CALLIN_')]),
-            'emergency_responses': len([t for t in self.completed_tasks if str(t.task_id).startswith('EMERGENCY_')]),
-            'preempted_tasks': len([t for t in self.cleaning_tasks if hasattr(t, '_was_preempted')]),
+            'usage_based_cleanings': self._completed_by_prefix['USAGE'],
+            'real_time_call_ins': self._completed_by_prefix['CALLIN'],
+            'emergency_responses': self._completed_by_prefix['EMERGENCY'],
+            'preempted_tasks': preempted_tasks,
             'total_restroom_usage': float(sum(self.restroom_usage_counts.values())),
             'restrooms_needing_attention': len([
                 r for r, count in self.restroom_usage_counts.items()
-                if count > 0.8 * getattr(self, 'usage_threshold_for_cleaning', 15)
+                if count > 0.8 * self.usage_threshold_for_cleaning
             ])
         }
 
@@ -1200,13 +2009,15 @@ class CleaningCrewOptimizer:
     
     def run_optimization(self,
                          waiting_time_data: Dict[str, np.ndarray],
-                         cleaning_requirements: List[Tuple[str, int]]) -> Dict:
+                         cleaning_requirements: List[Tuple[str, int]],
+                         verbose: bool = True) -> Dict:
         """
         Run the cleaning crew optimization simulation.
         
         Args:
             waiting_time_data: dict of section_id -> np.array of waiting times (sec)
             cleaning_requirements: list of (restroom_id, num_cleanings)
+            verbose: Print progress and urgent-task messages
         
         Returns:
             results dict with KPIs, costs, crew performance, task summary,
@@ -1227,35 +2038,41 @@ class CleaningCrewOptimizer:
         self.process_waiting_time_profile(waiting_time_data)
         self._schedule_cleanings_from_requirements(cleaning_requirements)
         
-        print("Running cleaning crew optimization simulation...")
-        
-        for t_idx, current_time in enumerate(self.time_steps):
-            if t_idx % max(1, len(self.time_steps) // 10) == 0:
-                progress = (t_idx / len(self.time_steps)) * 100
-                print(f"  Progress: {progress:.0f}% (t={current_time/3600:.1f} hours)")
-            
-            self.update_crew_status(current_time)
-            
-            urgent_tasks = self._check_for_real_time_call_ins(current_time, t_idx)
-            if urgent_tasks:
-                self.cleaning_tasks.extend(urgent_tasks)
-                self._handle_crew_reassignment(urgent_tasks, current_time)
-            
-            assignments = self.optimize_crew_assignment(current_time)
-            if assignments:
-                self.execute_assignments(assignments, current_time)
-                results['crew_assignments'].append({
-                    'time': current_time,
-                    'assignments': assignments.copy()
-                })
+        self.verbose = verbose
+        try:
+            self._log("Running cleaning crew optimization simulation...")
             
-            if t_idx % max(1, int(3600 // self.dt)) == 0:
-                kpis = self.calculate_kpis(current_time)
-                kpis['time'] = current_time
-                results['kpi_timeline'].append(kpis)
-                for key, value in kpis.items():
-                    if key != 'time' and key in self.kpi_history:
-                        self.kpi_history[key].append(value)
+            # Progress is reported every 10% of the steps, KPIs every hour
+            n_steps = self.n_steps
+            progress_interval = max(1, n_steps // 10)
+            for t_idx, current_time in enumerate(self.time_steps.tolist()):
+                if t_idx % progress_interval == 0:
+                    progress = (t_idx / n_steps) * 100
+                    self._log(f"  Progress: {progress:.0f}% (t={current_time/3600:.1f} hours)")
+                    self._flush_log()
+                
+                self.update_crew_status(current_time)
+                
+                urgent_tasks = self._check_for_real_time_call_ins(current_time, t_idx)
+                if urgent_tasks:
+                    self._add_tasks(urgent_tasks)
+                    self._handle_crew_reassignment(urgent_tasks, current_time)
+                
+                assignments = self.optimize_crew_assignment(current_time, t_idx)
+                if assignments:
+                    self.execute_assignments(assignments, current_time)
+                    results['crew_assignments'].append({
+                        'time': current_time,
+                        'assignments': assignments.copy()
+                    })
+                
+                if t_idx % self._kpi_interval == 0:
+                    kpis = self.calculate_kpis(current_time)
+                    kpis['time'] = current_time
+                    results['kpi_timeline'].append(kpis)
+                    self._record_kpis(t_idx, kpis)
+        finally:
+            self._flush_log()
         
         final_kpis = self.calculate_kpis(self.simulation_duration)
         final_kpis['time'] = self.simulation_duration
@@ -1269,16 +2086,17 @@ class CleaningCrewOptimizer:
         results['task_summary'] = self._summarize_tasks()
         
         # include schedule in results
-        results['crew_schedules'] = self.crew_schedules
+        results['crew_schedules'] = self.finalize_schedules()
         
         results['simulation_duration'] = self.simulation_duration
         results['simulation_dt'] = self.dt
-        results['total_time_steps'] = len(self.time_steps)
+        results['total_time_steps'] = self.n_steps
 
         # Convert all saved timestamps in results to ISO-8601 UTC strings
         self._convert_results_times_to_utc(results)
         
-        print("Cleaning crew optimization completed!")
+        self._log("Cleaning crew optimization completed!")
+        self._flush_log()
         return results
 
 
@@ -1359,11 +2177,71 @@ def load_cleaning_requirements_from_json(
     return [(rid, cnt) for rid, cnt in total_counts.items()]
 
 
+def _wait_block_seconds(rows: np.ndarray,
+                        cols: np.ndarray,
+                        minutes: np.ndarray,
+                        row_src: np.ndarray,
+                        n_rows: int,
+                        n_cols: int) -> np.ndarray:
+    """
+    Build a float32 (len(row_src), n_cols) block of wait seconds on the
+    simulation grid from (row, col, minutes) samples.
+
+    `rows` index a compact table of sample times (1-based; row 0 is the
+    all-zero row used before the first sample) and `row_src` gives, for each
+    grid step, the compact row holding the latest sample time at or before it.
+    """
+    compact = np.zeros((n_rows + 1, n_cols), dtype=np.float32)
+    compact[rows, cols] = minutes
+    # minutes -> seconds on the compact table, before it is expanded
+    compact *= np.float32(60.0)
+    return compact[row_src]
+
+
+def _wait_series_from_block(block: np.ndarray,
+                            washroom_ids: List[str]) -> Dict[str, np.ndarray]:
+    """Split a (T, W) block of wait seconds into per-section series."""
+    # Washrooms with identical series (e.g. synthesised defaults) share one
+    # row of a compact (K, T) table; rows are contiguous per series
+    unique_cols, col_of_washroom = np.unique(block, axis=1, return_inverse=True)
+    series = np.ascontiguousarray(unique_cols.T)
+    # Row views taken after this inherit the read-only flag
+    series.flags.writeable = False
+    # M and F share the same row view; built in one comprehension so the
+    # dict is sized once instead of growing key by key
+    return {
+        section_id: series[i]
+        for washroom_id, i in zip(washroom_ids, col_of_washroom.reshape(-1))
+        for section_id in (f"{washroom_id}-M", f"{washroom_id}-F")
+    }
+
+
+def _wait_cache_file(cache_dir: str,
+                     path: str,
+                     start_ts: pd.Timestamp,
+                     end_ts: pd.Timestamp,
+                     dt_seconds: int,
+                     dtype: np.dtype) -> str:
+    """Cache file for one (file version, range, dt, dtype) waiting-time load."""
+    stat = os.stat(path)
+    key_src = repr((
+        WAIT_CACHE_VERSION,
+        os.path.abspath(path), stat.st_mtime_ns, stat.st_size,
+        start_ts.isoformat(), end_ts.isoformat(), int(dt_seconds),
+        np.dtype(dtype).str,
+    ))
+    key = hashlib.sha1(key_src.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"waiting_{key}.npz")
+
+
 def load_waiting_time_from_json(
     path: str,
     start_ts: pd.Timestamp,
     end_ts: pd.Timestamp,
-    dt_seconds: int
+    dt_seconds: int,
+    n_jobs: int = -1,
+    cache_dir: Optional[str] = WAIT_CACHE_DIR,
+    dtype: np.dtype = np.float32
 ) -> Dict[str, np.ndarray]:
     """
     Load waiting time data from a JSON file structured like all_wait_times.json:
@@ -1383,69 +2261,181 @@ def load_waiting_time_from_json(
         }
 
     We:
-      1) Flatten to rows (datetime, washroom, avg_wait_minutes),
+      1) Flatten to columns (datetime, washroom, avg_wait_minutes),
       2) Filter datetimes in [start_ts, end_ts),
-      3) Pivot to wide format and resample at `dt_seconds`,
-      4) Convert minutes -> seconds,
+      3) Snap samples to a `dt_seconds` grid and scatter them into a
+         (time x washroom) block, carrying values forward between samples,
+      4) Convert minutes -> seconds (as float32),
       5) For each washroom W, create two series "W-M" and "W-F"
          (to match the optimizer's section_id convention).
+
+    With many washrooms, step 3-4 runs in parallel over chunks of
+    WAIT_WASHROOMS_PER_JOB washrooms (`n_jobs` as in joblib; 1 = serial).
+
+    `dtype` may be an unsigned integer type (e.g. np.uint16) to store wait
+    times as whole seconds, rounded and clipped to the type's range; this
+    halves memory again but can move a wait across a call-in threshold by
+    up to half a second, so float32 stays the default.
+
+    The resulting block is cached as an .npz under `cache_dir`, keyed by the
+    file (path, mtime, size), the range, dt_seconds and dtype, so repeated runs
+    skip the parsing entirely. Pass cache_dir=None to disable the cache.
+
+    "W-M" and "W-F" are the same read-only array (a row view of one shared
+    table), as are the series of washrooms whose wait times are identical,
+    so callers must copy before modifying a series.
     """
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = _wait_cache_file(cache_dir, path, start_ts, end_ts, dt_seconds, dtype)
+        if os.path.exists(cache_file):
+            with np.load(cache_file) as cached:
+                return _wait_series_from_block(cached["block"], cached["washrooms"].tolist())
+
     with open(path, "r") as f:
         raw = json.load(f)
 
-    rows = []
+    # Flatten straight into typed columns, one (date, washroom) block at a
+    # time; washroom ids are interned as int codes. Intervals without
+    # metrics are tagged with -inf and dropped after parsing.
+    washroom_codes: Dict[str, int] = {}
+    ts_strs: List[str] = []
+    code_blocks: List[np.ndarray] = []
+    value_blocks: List[np.ndarray] = []
     # Outer keys are typically date strings; second level washrooms; third level intervals
     for _date_key, washrooms in raw.items():
         for washroom_id, intervals in washrooms.items():
-            for dt_str, metrics in intervals.items():
-                ts = pd.to_datetime(dt_str)
-                if not (start_ts <= ts < end_ts):
-                    continue
-                if metrics is None:
-                    continue
-                val = metrics.get("avg_wait_minutes")
-                if val is None:
-                    val = 0.0
-                rows.append(
-                    {
-                        "datetime": ts,
-                        "washroom": washroom_id,
-                        "avg_wait_minutes": float(val)
-                    }
-                )
-
-    if not rows:
+            code = washroom_codes.setdefault(washroom_id, len(washroom_codes))
+            n = len(intervals)
+            ts_strs.extend(intervals)
+            code_blocks.append(np.full(n, code, dtype=np.int32))
+            value_blocks.append(np.fromiter(
+                (-np.inf if m is None else (m.get("avg_wait_minutes") or 0.0)
+                 for m in intervals.values()),
+                dtype=np.float32, count=n
+            ))
+    codes = np.concatenate(code_blocks) if code_blocks else np.empty(0, dtype=np.int32)
+    values = np.concatenate(value_blocks) if value_blocks else np.empty(0, dtype=np.float32)
+
+    # Parse all timestamps in one vectorised call (fixed format, repeated
+    # strings parsed once), then filter the range on int64 nanoseconds
+    ts = pd.to_datetime(ts_strs, format=WAIT_TIME_FORMAT, cache=True)
+    ts_ns = ts.as_unit("ns").asi8
+    in_range = (ts_ns >= start_ts.value) & (ts_ns < end_ts.value) & (values != -np.inf)
+    if not in_range.any():
         raise ValueError(
             f"No waiting time rows found in {path} within range {start_ts} to {end_ts}."
         )
 
-    df = pd.DataFrame(rows)
-    df = df.sort_values("datetime")
+    ts_ns = ts_ns[in_range]
+    codes = codes[in_range]
+    minutes = np.nan_to_num(values[in_range], copy=False, nan=0.0)
 
-    # Pivot to wide: each washroom is a column
-    df_wide = df.pivot(index="datetime", columns="washroom", values="avg_wait_minutes")
-
-    # Resample to dt_seconds and forward-fill, then fill remaining NaNs with 0
-    freq = f"{dt_seconds}S"
-    df_wide = df_wide.resample(freq).ffill().fillna(0.0)
+    # Columns: washrooms with samples in range, sorted by id
+    present = np.unique(codes)
+    names = list(washroom_codes)
+    order = sorted(range(len(present)), key=lambda i: names[present[i]])
+    columns = [names[present[i]] for i in order]
+    col_of_code = np.full(len(names), -1, dtype=np.int64)
+    col_of_code[present[order]] = np.arange(len(columns))
+    cols = col_of_code[codes]
 
     # Ensure we cover exactly the simulation range [start_ts, end_ts)
     total_seconds = (end_ts - start_ts).total_seconds()
     expected_len = int(total_seconds / dt_seconds)
+    dt_ns = int(round(dt_seconds * 1_000_000_000))
+
+    # Snap sample times to grid steps with integer arithmetic: a sample at t
+    # is first visible at step ceil((t - start) / dt). A grid step sees the
+    # latest sample time at or before it, and washrooms without a reading at
+    # that time read 0, so only the last distinct sample time per step
+    # matters. Steps with no new sample time carry the previous one forward.
+    times, time_of_sample = np.unique(ts_ns, return_inverse=True)
+    time_step = -((start_ts.value - times) // dt_ns)
+    is_last = np.append(time_step[1:] != time_step[:-1], True) & (time_step < expected_len)
+    time_row = np.cumsum(is_last)
+    row_src = np.zeros(expected_len, dtype=np.int64)
+    row_src[time_step[is_last]] = time_row[is_last]
+    np.maximum.accumulate(row_src, out=row_src)
+    n_rows = int(time_row[-1])
+
+    keep = is_last[time_of_sample]
+    rows = time_row[time_of_sample][keep]
+    cols = cols[keep]
+    minutes = minutes[keep]
+
+    # Build the (T, W) block in washroom chunks; only worth fanning out to
+    # workers once there are several chunks' worth of washrooms
+    bounds = list(range(0, len(columns), WAIT_WASHROOMS_PER_JOB)) + [len(columns)]
+    chunks = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        sel = (cols >= lo) & (cols < hi)
+        chunks.append((rows[sel], cols[sel] - lo, minutes[sel], row_src, n_rows, hi - lo))
+    if n_jobs == 1 or len(chunks) == 1:
+        blocks = [_wait_block_seconds(*chunk) for chunk in chunks]
+    else:
+        blocks = Parallel(n_jobs=n_jobs)(
+            delayed(_wait_block_seconds)(*chunk) for chunk in chunks
+        )
+    arr = blocks[0] if len(blocks) == 1 else np.hstack(blocks)
+    if np.issubdtype(dtype, np.integer):
+        arr = np.clip(np.rint(arr), 0, np.iinfo(dtype).max).astype(dtype)
 
-    # Reindex to exact expected timestamps
-    idx = pd.date_range(start=start_ts, periods=expected_len, freq=freq)
-    df_wide = df_wide.reindex(idx).ffill().fillna(0.0)
+    if cache_file is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "wb") as f:
+                np.savez(f, block=arr, washrooms=np.array(columns, dtype=str))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: could not write waiting time cache {cache_file} ({e}).")
+
+    return _wait_series_from_block(arr, columns)
 
-    waiting_time_data: Dict[str, np.ndarray] = {}
-    # Convert minutes to seconds and duplicate for M/F
-    for washroom_id in df_wide.columns:
-        # minutes -> seconds
-        series_sec = (df_wide[washroom_id].astype(float) * 60.0).to_numpy()
-        waiting_time_data[f"{washroom_id}-M"] = series_sec
-        waiting_time_data[f"{washroom_id}-F"] = series_sec
 
-    return waiting_time_data
+@functools.lru_cache(maxsize=None)
+def _read_config_text(path: str, mtime_ns: int) -> str:
+    """
+    Contents of a crew config file, memoised on (path, modification time)
+    so building several optimizers from one config reads it once; an
+    edited file has a new mtime and is read again.
+    """
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def _read_json(path: str):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_crew_schedules_json(crew_schedules: Dict[str, List[Dict]], path: str) -> None:
+    """
+    Write crew_schedules to `path` as 2-space indented JSON.
+
+    Uses orjson when it is installed (several times faster, and serialises
+    numpy scalars/arrays natively); otherwise falls back to the stdlib
+    json encoder with the same layout. Either way the file is written one
+    crew at a time rather than from a single fully-serialised buffer.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        with open(path, "wb") as f:
+            if not crew_schedules:
+                f.write(b"{}")
+                return
+            sep = b"{\n  "
+            for crew_id, events in crew_schedules.items():
+                # Nest the crew's indented list one level under the top dict
+                body = orjson.dumps(events, option=option).replace(b"\n", b"\n  ")
+                f.write(sep + orjson.dumps(crew_id) + b": " + body)
+                sep = b",\n  "
+            f.write(b"\n}")
+    else:
+        # json.dump already streams encoder chunks to the file
+        with open(path, "w", buffering=1 << 16) as f:
+            json.dump(crew_schedules, f, indent=2)
 
 
 # ---------------------- CLI ENTRY POINT -----------------------
@@ -1501,17 +2491,38 @@ if __name__ == "__main__":
         default="crew_config.json",
         help="Optional path to crew configuration JSON file (default: crew_config.json).",
     )
+    parser.add_argument(
+        "--no-wait-cache",
+        dest="wait_cache",
+        action="store_false",
+        help=f"Do not read or write the parsed waiting time cache in {WAIT_CACHE_DIR}.",
+    )
+    parser.add_argument(
+        "--shortest-path-travel",
+        action="store_true",
+        help="Route crews along the fastest path through the travel time matrix instead of its direct entries.",
+    )
+    parser.add_argument(
+        "--wait-dtype",
+        choices=["float32", "uint16", "uint32"],
+        default="float32",
+        help="Storage type for waiting times; integer types hold whole seconds (default: float32).",
+    )
+    parser.add_argument(
+        "--assignment-method",
+        choices=ASSIGNMENT_METHODS,
+        default="greedy",
+        help="How ready tasks are matched to available crew each step (default: greedy).",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print simulation progress and urgent-task messages.",
+    )
 
     args = parser.parse_args()
 
-    # 1. Load restrooms and travel-time matrix
-    with open(args.restrooms, "r") as f:
-        restrooms = json.load(f)
-
-    with open(args.travel_time_matrix, "r") as f:
-        travel_time_matrix = json.load(f)
-
-    # 2. Parse simulation date range and compute duration in seconds
+    # 1. Parse simulation date range and compute duration in seconds
     start_ts, end_ts = parse_simulation_datetime_range(args.simulation_duration)
     simulation_duration_seconds = (end_ts - start_ts).total_seconds()
     if simulation_duration_seconds <= 0:
@@ -1521,20 +2532,31 @@ if __name__ == "__main__":
 
     dt = float(args.dt)
 
-    # 3. Load and filter cleaning requirements for the given date range
-    cleaning_requirements_list = load_cleaning_requirements_from_json(
-        args.cleaning_requirements,
-        start_ts=start_ts,
-        end_ts=end_ts,
-    )
-
-    # 4. Load waiting time profile for the same date range and dt
-    waiting_time_data = load_waiting_time_from_json(
-        args.waiting_time,
-        start_ts=start_ts,
-        end_ts=end_ts,
-        dt_seconds=args.dt,
-    )
+    # 2-4. The input files are independent, so load them concurrently:
+    #   restrooms + travel-time matrix, cleaning requirements for the date
+    #   range, and the waiting time profile for the same range and dt
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        restrooms_future = pool.submit(_read_json, args.restrooms)
+        travel_time_future = pool.submit(_read_json, args.travel_time_matrix)
+        requirements_future = pool.submit(
+            load_cleaning_requirements_from_json,
+            args.cleaning_requirements,
+            start_ts=start_ts,
+            end_ts=end_ts,
+        )
+        waiting_time_future = pool.submit(
+            load_waiting_time_from_json,
+            args.waiting_time,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            dt_seconds=args.dt,
+            cache_dir=WAIT_CACHE_DIR if args.wait_cache else None,
+            dtype=np.dtype(args.wait_dtype),
+        )
+        restrooms = restrooms_future.result()
+        travel_time_matrix = travel_time_future.result()
+        cleaning_requirements_list = requirements_future.result()
+        waiting_time_data = waiting_time_future.result()
 
     # 5. Create optimizer and run
     optimizer = CleaningCrewOptimizer(
@@ -1543,11 +2565,14 @@ if __name__ == "__main__":
         simulation_duration=simulation_duration_seconds,
         dt=dt,
         config_path=args.config,
+        shortest_path_travel=args.shortest_path_travel,
+        assignment_method=args.assignment_method,
     )
 
     results = optimizer.run_optimization(
         waiting_time_data=waiting_time_data,
         cleaning_requirements=cleaning_requirements_list,
+        verbose=not args.quiet,
     )
 
     # 6. Basic inspection of outputs (now timestamps are ISO-8601 UTC strings)
@@ -1571,5 +2596,4 @@ if __name__ == "__main__":
         print(crew_schedules[first_crew_id])
 
     # Save crew schedules to JSON
-    with open("crew_schedules_output.json", "w") as f:
-        json.dump(crew_schedules, f, indent=2)
+    save_crew_schedules_json(crew_schedules, "crew_schedules_output.json")